@@ -0,0 +1,453 @@
+# Offscreen benchmarks for the widget's hot paths, run against a local stub exchange.
+# Writes one JSON document so runs can be kept and diffed across changes:
+#   python benchmarks/bench_widget.py -o results.json
+#   python benchmarks/bench_widget.py --quick --compare results.json
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+from stub_exchange import StubExchange  # noqa: E402
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def summarize(samples) -> dict:
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p50_ms": round(ms[len(ms) // 2], 4),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 4),
+        "min_ms": round(ms[0], 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+def rss_kb() -> int:
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def load_module(stub: StubExchange, home: str):
+    # the module reads URLs and the home directory at import time; the caller's
+    # environment is put back afterwards (the Qt platform has to outlive the import)
+    env = dict(HOME=home, USERPROFILE=home, CRYPTO_WIDGET_API_URL=stub.url,
+               CRYPTO_WIDGET_OKX_URL=stub.url, CRYPTO_WIDGET_ICON_URL=stub.url)
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        spec = importlib.util.spec_from_file_location("crypto_widget", os.path.join(ROOT, "crypto-widget.py"))
+        cw = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(cw)
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    cw.config.update(
+        feed_enabled=False, stream_enabled=False, price_sources=["binance"],
+        cycle_enabled=False, update_interval=3600, display_mode="slide",
+    )
+    return cw
+
+
+def symbols_for(n: int) -> list:
+    base = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]
+    return (base + [f"C{i}USDT" for i in range(n)])[:n]
+
+
+def pump(app, until, timeout: float = 30.0):
+    end = time.perf_counter() + timeout
+    while not until():
+        if time.perf_counter() > end:
+            raise TimeoutError("benchmark step timed out")
+        app.processEvents()
+        time.sleep(0.0005)
+
+
+def idle(app, widget):
+    pump(app, lambda: not widget.scheduler.stats()["in_flight"] and not widget.scheduler.stats()["queued"])
+    app.processEvents()
+
+
+def set_watchlist(cw, app, widget, symbols):
+    cw.config["watchlist"] = [{"symbol": s, "decimals": 2} for s in symbols]
+    widget.apply_settings()
+    idle(app, widget)
+
+
+# ---------- benchmarks ----------
+def bench_fetch(cw, sizes, rounds) -> dict:
+    out = {}
+    for n in sizes:
+        symbols = symbols_for(n)
+        cw.fetch_prices(symbols)  # warm the connection pool
+        samples = []
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            prices = cw.fetch_prices(symbols)
+            samples.append(time.perf_counter() - t0)
+        assert sum(p is not None for p in prices.values()) == n
+        stats = summarize(samples)
+        stats["symbols_per_s"] = round(n / statistics.fmean(samples), 1)
+        out[str(n)] = stats
+    return out
+
+
+def bench_update_prices(cw, app, widget, sizes, rounds) -> dict:
+    # end to end: submit, fetch on the scheduler, and apply the result on the GUI thread
+    done = []
+    widget.fetch_bridge.finished.connect(
+        lambda kind, items, result, error: done.append(time.perf_counter()) if kind == "price" else None)
+    out = {}
+    for n in sizes:
+        set_watchlist(cw, app, widget, symbols_for(n))
+        samples = []
+        for _ in range(rounds):
+            done.clear()
+            t0 = time.perf_counter()
+            widget.update_prices()
+            pump(app, lambda: done)
+            samples.append(done[0] - t0)
+        stats = summarize(samples)
+        stats["symbols_per_s"] = round(n / statistics.fmean(samples), 1)
+        out[str(n)] = stats
+    return out
+
+
+def bench_slide_paint(cw, app, widget, frames) -> dict:
+    set_watchlist(cw, app, widget, symbols_for(3))
+    cw.config["cycle_enabled"] = True
+    out = {}
+    try:
+        for label in ("cold", "warm"):
+            if label == "cold":
+                widget._slide_cache.clear()
+            widget.start_slide()
+            widget.slide_anim.stop()  # frames are stepped by hand so each repaint is timed alone
+            width = widget.width()
+            samples = []
+            for i in range(1, frames + 1):
+                widget._slide_step(width * (1 - i / frames))
+                t0 = time.perf_counter()
+                widget.repaint()
+                samples.append(time.perf_counter() - t0)
+            widget._slide_finished()
+            # come back to the first slide so the warm pass paints the same pair
+            widget.current_index = widget.prev_index
+            stats = summarize(samples)
+            stats["over_budget"] = sum(s * 1000 > FRAME_BUDGET_MS for s in samples)
+            out[label] = stats
+    finally:
+        cw.config["cycle_enabled"] = False
+    return out
+
+
+def bench_resize(cw, app, widget, calls) -> dict:
+    set_watchlist(cw, app, widget, symbols_for(12))
+    out = {}
+    for mode in cw.DISPLAY_MODES:
+        cw.config["display_mode"] = mode
+        widget._apply_display_mode()
+        samples = []
+        for _ in range(calls):
+            t0 = time.perf_counter()
+            widget._resize_to_content()
+            samples.append(time.perf_counter() - t0)
+        out[mode] = summarize(samples)
+    cw.config["display_mode"] = "slide"
+    widget._apply_display_mode()
+    return out
+
+
+def bench_icons(cw, stub, count) -> dict:
+    from PyQt6.QtCore import QBuffer, QIODevice
+    from PyQt6.QtGui import QColor, QImage, QPixmap
+    symbols = [f"C{i}USDT" for i in range(count)]
+    for i, symbol in enumerate(symbols):
+        img = QImage(128, 128, QImage.Format.Format_ARGB32)
+        img.fill(QColor(40 + i % 200, 120, 200))
+        buf = QBuffer()
+        buf.open(QIODevice.OpenModeFlag.WriteOnly)
+        img.save(buf, "PNG")
+        stub.icons[f"{symbol[:-4]}.png"] = bytes(buf.data())
+    shutil.rmtree(cw.ICON_CACHE_DIR, ignore_errors=True)
+    out = {}
+    for label in ("network", "disk"):
+        cw.icon_cache.clear()
+        t0 = time.perf_counter()
+        images = cw.load_icon_images(symbols)
+        elapsed = time.perf_counter() - t0
+        assert all(images.values())
+        out[f"load_{label}"] = {"icons": count, "total_ms": round(elapsed * 1000, 3),
+                                "per_icon_ms": round(elapsed * 1000 / count, 4)}
+    for symbol, img in images.items():
+        cw.icon_cache.put(symbol[:-4], QPixmap.fromImage(img))
+    for label in ("cold", "warm"):
+        samples = []
+        for symbol in symbols:
+            for size in (24, 40, 64):
+                t0 = time.perf_counter()
+                cw.icon_cache.scaled(symbol[:-4], size, 1.0)
+                samples.append(time.perf_counter() - t0)
+        out[f"scale_{label}"] = summarize(samples)
+    out["cache"] = cw.icon_cache.stats()
+    return out
+
+
+class SimulatedClock:
+    # stands in for the time module inside the widget so hours of polling run in seconds
+    def __init__(self, start: float):
+        self.now = start
+    def time(self) -> float:
+        return self.now
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def bench_memory(cw, app, widget, symbols, cycles) -> dict:
+    set_watchlist(cw, app, widget, symbols_for(symbols))
+    interval = float(cw.config.get("update_interval", 10))
+    interval = 10.0 if interval > 60 else interval
+    clock = SimulatedClock(time.time())
+    real_time, cw.time = cw.time, clock
+    widget.tick_flush_timer.stop()
+    gc.collect()
+    tracemalloc.start()
+    base_heap, base_rss = tracemalloc.get_traced_memory()[0], rss_kb()
+    checkpoints = []
+    prices = {s: 100.0 + i for i, s in enumerate(widget.watchlist.symbols)}
+    try:
+        for cycle in range(1, cycles + 1):
+            clock.now += interval
+            for j, s in enumerate(prices):
+                prices[s] *= 1.0 + 0.001 * (((cycle + j) % 7) - 3)
+            widget._on_prices_fetched(dict(prices))
+            if cycle % 10 == 0:
+                widget.current_index = cycle // 10 % len(widget.watchlist)
+                widget.repaint()
+            if cycle % 3 == 0:
+                widget.tick_store.flush()  # the 30 s flush timer, in simulated time
+            if cycle % max(1, cycles // 10) == 0:
+                gc.collect()
+                checkpoints.append({"sim_hours": round(cycle * interval / 3600, 2),
+                                    "heap_kb": round((tracemalloc.get_traced_memory()[0] - base_heap) / 1024, 1)})
+        gc.collect()
+        heap, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        cw.time = real_time
+    return {
+        "symbols": symbols, "cycles": cycles, "ticks": cycles * symbols,
+        "simulated_hours": round(cycles * interval / 3600, 2),
+        "heap_growth_kb": round((heap - base_heap) / 1024, 1),
+        "heap_peak_kb": round((peak - base_heap) / 1024, 1),
+        "rss_growth_kb": rss_kb() - base_rss if base_rss else None,
+        "tick_store_kb": round(os.path.getsize(cw.TICK_STORE_FILE) / 1024, 1)
+        if os.path.exists(cw.TICK_STORE_FILE) else 0,
+        "slide_cache_entries": len(widget._slide_cache),
+        "checkpoints": checkpoints,
+    }
+
+
+def naive_alerts(rules, prev, price, change, last_change):
+    # the scan the index replaces: every rule of the symbol, every tick
+    fired = 0
+    for rule in rules:
+        if rule.kind == "move_pct":
+            value, before = change, last_change
+        else:
+            value, before = price, prev
+        if value is None or before is None:
+            continue
+        if (rule.rising and before < rule.value <= value) or (not rule.rising and value <= rule.value < before):
+            fired += 1
+    return fired
+
+
+def bench_alerts(cw, rule_counts, rounds, symbols=50) -> dict:
+    # rules spread over the symbols, levels within +-10% of the price; every round moves
+    # every symbol by up to 0.5% and evaluates it once, as _on_price_fetched does
+    import random
+    rng = random.Random(20)
+    names = symbols_for(symbols)
+    out = {}
+    for count in rule_counts:
+        now = 1_000_000.0
+        prices = {s: 100.0 * (1 + i) for i, s in enumerate(names)}
+        histories = {}
+        for s in names:
+            hist = cw.PriceHistory(720, 24 * 3600)
+            for k in range(240):
+                hist.append(now - (240 - k) * 60, prices[s])
+            histories[s] = hist
+        rules = []
+        for i in range(count):
+            s = names[i % symbols]
+            kind = cw.ALERT_KINDS[rng.randrange(len(cw.ALERT_KINDS))]
+            if kind == "move_pct":
+                value = rng.choice((-1, 1)) * rng.uniform(0.5, 10)
+                rules.append(cw.AlertRule(s, kind, value, window=rng.choice((15, 60, 240)) * 60))
+            else:
+                rules.append(cw.AlertRule(s, kind, prices[s] * rng.uniform(0.9, 1.1)))
+        t0 = time.perf_counter()
+        engine = cw.AlertEngine(rules)
+        build = time.perf_counter() - t0
+        by_symbol = {s: [r for r in rules if r.symbol == s] for s in names}
+        walk = []
+        for _ in range(rounds):
+            now += 10
+            for s in names:
+                prices[s] *= 1 + rng.uniform(-0.005, 0.005)
+            walk.append((now, dict(prices)))
+        indexed, fired = [], 0
+        for now, tick in walk:
+            t0 = time.perf_counter()
+            for s, price in tick.items():
+                histories[s].append(now, price)
+                fired += len(engine.evaluate(s, price, now, histories[s]))
+            indexed.append((time.perf_counter() - t0) / symbols)
+        naive, prev, moves = [], {}, {}
+        for now, tick in walk:
+            t0 = time.perf_counter()
+            for s, price in tick.items():
+                for window in (900, 3600, 14400):
+                    ref = histories[s].price_at(now - window)
+                    change = (price - ref) / ref * 100 if ref else None
+                    naive_alerts(by_symbol[s], prev.get(s), price, change, moves.get((s, window)))
+                    moves[(s, window)] = change
+                prev[s] = price
+            naive.append((time.perf_counter() - t0) / symbols)
+        stats = engine.stats()
+        out[str(count)] = {
+            "rules_per_symbol": count // symbols,
+            "build_ms": round(build * 1000, 3),
+            "per_tick": summarize(indexed),
+            "naive_per_tick": summarize(naive),
+            "checked_per_tick": round(stats["checked"] / stats["ticks"], 2),
+            "fired": fired,
+        }
+    return out
+
+
+# ---------- runner ----------
+def flatten(obj, prefix=""):
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        yield prefix, obj
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    # only cost-like metrics, and only ones big enough for the ratio to mean something
+    old = dict(flatten(baseline.get("results", {})))
+    regressions = []
+    for key, value in flatten(results["results"]):
+        if not key.endswith(("mean_ms", "p50_ms", "p95_ms", "total_ms", "per_icon_ms", "_growth_kb")):
+            continue
+        before = old.get(key)
+        # sub-half-millisecond timings and small heap deltas are mostly scheduler noise
+        if before is None or before < (256 if key.endswith("_kb") else 0.5):
+            continue
+        ratio = value / before
+        if ratio > 1 + threshold:
+            regressions.append({"metric": key, "baseline": before, "current": value, "ratio": round(ratio, 2)})
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the crypto widget's fetch, render and animation paths")
+    parser.add_argument("-o", "--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer rounds")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag metrics that got slower than this results file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before flagging (default 0.25)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated server latency per request")
+    args = parser.parse_args(argv)
+
+    sizes = (3, 50) if args.quick else (3, 10, 50, 100, 250, 500)
+    rounds = 5 if args.quick else 20
+    stub = StubExchange(latency_ms=args.latency_ms).start()
+    home = tempfile.mkdtemp(prefix="cw-bench-")
+    cw = load_module(stub, home)
+    from PyQt6.QtCore import PYQT_VERSION_STR
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    widget = cw.CryptoWidget()
+    widget._start_background()
+    idle(app, widget)
+
+    results = {
+        "fetch_prices": bench_fetch(cw, sizes, rounds),
+        "update_prices": bench_update_prices(cw, app, widget, sizes, rounds),
+        "slide_paint": bench_slide_paint(cw, app, widget, 30 if args.quick else 120),
+        "resize_to_content": bench_resize(cw, app, widget, 50 if args.quick else 500),
+        "icons": bench_icons(cw, stub, 20 if args.quick else 100),
+        "alerts": bench_alerts(cw, (1000, 10000) if args.quick else (1000, 10000, 100000), 20 if args.quick else 100),
+        "memory": bench_memory(cw, app, widget, 20 if args.quick else 50, 1000 if args.quick else 8640),
+    }
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "quick": args.quick,
+            "stub_latency_ms": args.latency_ms,
+            "requests_served": stub.requests,
+        },
+        "results": results,
+    }
+    widget.scheduler.shutdown()
+    stub.stop()
+    shutil.rmtree(home, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        if baseline.get("meta", {}).get("quick") != args.quick:
+            sys.stderr.write("warning: baseline and this run used different --quick settings\n")
+        regressions = compare(report, baseline, args.threshold)
+        for r in regressions:
+            sys.stderr.write(f"REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} (x{r['ratio']})\n")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
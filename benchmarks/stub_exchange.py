@@ -0,0 +1,106 @@
+# Local stand-in for the Binance / OKX REST endpoints and the icon CDN, so benchmarks
+# measure the widget rather than the internet.
+import hashlib
+import json
+import threading
+import time
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class StubExchange:
+    def __init__(self, symbols=600, latency_ms: float = 0.0):
+        self.prices = {"BTCUSDT": 65000.12, "ETHUSDT": 3200.5, "SOLUSDT": 150.25, "XRPUSDT": 0.52}
+        for i in range(symbols):
+            self.prices.setdefault(f"C{i}USDT", 1.0 + i)
+        self.icons = {}
+        self.latency = latency_ms / 1000.0
+        self.requests = 0
+        # test hooks: per-path (status, headers) overrides, per-path extra latency in
+        # seconds, the symbols OKX lists (None: all), and (path, status) per request
+        self.responses = {}
+        self.path_latency = {}
+        self.okx_symbols = None
+        self.log = []
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name="stub-exchange", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def tick(self, factor: float = 1.0001):
+        with self._lock:
+            for symbol in self.prices:
+                self.prices[symbol] *= factor
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body in one segment; otherwise Nagle plus delayed ACKs add ~40 ms per request
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code, body=b"", ctype="application/json", headers=None):
+                with stub._lock:
+                    stub.log.append((urllib.parse.urlparse(self.path).path, code))
+                self.send_response(code)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                query = urllib.parse.parse_qs(url.query)
+                with stub._lock:
+                    stub.requests += 1
+                    prices = dict(stub.prices)
+                    override = stub.responses.get(url.path)
+                    okx_symbols = stub.okx_symbols
+                delay = stub.latency + stub.path_latency.get(url.path, 0.0)
+                if delay:
+                    time.sleep(delay)
+                if override is not None:
+                    return self._send(override[0], b"{}", headers=override[1])
+                if url.path == "/api/v3/ticker/price":
+                    if "symbols" in query:
+                        wanted = json.loads(query["symbols"][0])
+                        if any(s not in prices for s in wanted):
+                            return self._send(400, b'{"code":-1121,"msg":"Invalid symbol."}')
+                        rows = [{"symbol": s, "price": f"{prices[s]:.8f}"} for s in wanted]
+                    else:
+                        rows = [{"symbol": s, "price": f"{p:.8f}"} for s, p in prices.items()]
+                    return self._send(200, json.dumps(rows).encode(), headers={"X-MBX-USED-WEIGHT-1M": "4"})
+                if url.path == "/api/v5/market/tickers":
+                    rows = [{"instId": f"{s[:-4]}-USDT", "last": f"{p:.8f}"} for s, p in prices.items()
+                            if okx_symbols is None or s in okx_symbols]
+                    return self._send(200, json.dumps({"code": "0", "msg": "", "data": rows}).encode())
+                if url.path.startswith("/static/assets/logos/"):
+                    data = stub.icons.get(url.path.rsplit("/", 1)[1])
+                    if data is None:
+                        return self._send(404)
+                    etag = '"' + hashlib.md5(data).hexdigest() + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        return self._send(304, headers={"ETag": etag})
+                    return self._send(200, data, ctype="image/png", headers={"ETag": etag})
+                return self._send(404)
+
+        return Handler
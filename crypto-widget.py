@@ -1,55 +1,1250 @@
 # crypto_widget_modern_slide_preloaded.py
+import time
+_T0 = time.perf_counter()  # origin for the startup milestones below
 import sys
+import argparse
+import atexit
 import os
 import json
+import math
+import mmap
+import random
+import struct
+import functools
+import asyncio
+import hashlib
+import socket
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait as wait_futures
 from typing import Optional
+from urllib.parse import urlsplit
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton, QSpinBox,
-    QLineEdit, QSlider, QMenu, QDialog, QLabel, QHBoxLayout, QCheckBox,
-    QGridLayout, QFrame, QSizePolicy, QMessageBox, QGraphicsDropShadowEffect
+    QSlider, QMenu, QDialog, QLabel, QHBoxLayout, QCheckBox,
+    QFrame, QSizePolicy, QMessageBox, QGraphicsDropShadowEffect,
+    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QSystemTrayIcon
 )
-from PyQt6.QtGui import QFont, QColor, QPainter, QFontMetrics, QPixmap, QAction
-from PyQt6.QtCore import Qt, QTimer, QPoint, pyqtSignal, QThread
-import requests
-import ctypes
+from PyQt6.QtGui import (
+    QFont, QColor, QPainter, QFontMetrics, QPixmap, QImage, QAction, QRegion, QPen, QPolygonF, QIcon
+)
+from PyQt6.QtCore import (
+    Qt, QTimer, QPoint, QPointF, pyqtSignal, QObject, QUrl, QRect, QVariantAnimation, QEasingCurve,
+    QFileSystemWatcher
+)
+try:
+    from PyQt6.QtWebSockets import QWebSocket
+except ImportError:  # streaming is optional; polling still works without QtWebSockets
+    QWebSocket = None
+try:
+    from PyQt6.QtNetwork import QTcpSocket
+except ImportError:  # the shared price feed is optional too
+    QTcpSocket = None
+# requests, numpy and ctypes are imported where first used, so none of them
+# sit between launch and the first painted frame
 
 # ---------- Config ----------
 SETTINGS_FILE = os.path.join(os.path.expanduser("~"), "crypto_widget_settings.json")
 ICON_CACHE_DIR = os.path.join(os.path.expanduser("~"), "crypto_widget_icons")
-os.makedirs(ICON_CACHE_DIR, exist_ok=True)
+TICK_STORE_FILE = os.path.join(os.path.expanduser("~"), "crypto_widget_ticks.bin")
+BINANCE_API_URL = os.environ.get("CRYPTO_WIDGET_API_URL", "https://api.binance.com")
+BINANCE_STREAM_URL = os.environ.get("CRYPTO_WIDGET_STREAM_URL", "wss://stream.binance.com:9443")
+OKX_API_URL = os.environ.get("CRYPTO_WIDGET_OKX_URL", "https://www.okx.com")
+ICON_BASE_URL = os.environ.get("CRYPTO_WIDGET_ICON_URL", "https://bin.bnbstatic.com")
 
 DEFAULT_CONFIG = {
-    "symbol1": "BTCUSDT",
-    "symbol2": "ETHUSDT",
-    "symbol3": "SOLUSDT",
-    "decimals1": 2,
-    "decimals2": 2,
-    "decimals3": 2,
+    "watchlist": [
+        {"symbol": "BTCUSDT", "decimals": 2},
+        {"symbol": "ETHUSDT", "decimals": 2},
+        {"symbol": "SOLUSDT", "decimals": 2},
+    ],
     "text_size": 24,
     "bg_opacity": 0.7,
     "update_interval": 10,
+    "offscreen_interval_factor": 6,
+    "max_backoff": 300,
+    "rate_limit_weight": 6000,
+    "rate_limit_budget": 0.5,
     "cycle_interval": 3,
     "cycle_enabled": True,
+    "display_mode": "slide",
+    "ticker_width": 480,
+    "ticker_speed": 60,
+    "grid_columns": 3,
+    "grid_rows": 4,
+    "sparkline_enabled": True,
+    "history_hours": 24,
+    "history_points": 720,
+    "tick_retention_hours": 72,
+    "tick_store_mb": 32,
+    "slide_duration_ms": 450,
+    "slide_easing": "ease_out",
+    "stream_enabled": False,
+    "stream_kind": "miniTicker",
+    "feed_enabled": True,
+    "feed_port": 47711,
+    "metrics_overlay": False,
+    "metrics_server": False,
+    "metrics_port": 47712,
     "pos_x": 200,
-    "pos_y": 200
+    "pos_y": 200,
+    "http_connect_timeout": 3.05,
+    "http_read_timeout": 6,
+    "http_retries": 2,
+    "http_backoff": 0.3,
+    "http_pool_per_host": 4,
+    "max_concurrent_fetches": 4,
+    "icon_cache_mb": 16,
+    "icon_ttl_hours": 24,
+    "price_sources": ["binance", "okx"],
+    "price_source_mode": "failover",
+    "price_source_cooldown": 30,
+    "alerts": [],
+    "settings_version": 2
 }
 config = DEFAULT_CONFIG.copy()
+DISPLAY_MODES = ("slide", "ticker", "grid")
+SETTINGS_LIMITS = {
+    "text_size": (8, 64), "bg_opacity": (0.0, 1.0), "update_interval": (5, 3600),
+    "offscreen_interval_factor": (1, 100), "max_backoff": (10, 86400), "rate_limit_weight": (1, 1000000),
+    "rate_limit_budget": (0.05, 1.0), "cycle_interval": (3, 3600), "ticker_width": (200, 10000),
+    "ticker_speed": (1, 2000), "grid_columns": (1, 20), "grid_rows": (1, 20), "history_hours": (1, 720),
+    "history_points": (10, 100000), "tick_retention_hours": (1, 8760), "tick_store_mb": (1, 4096),
+    "slide_duration_ms": (100, 2000), "feed_port": (1, 65535), "metrics_port": (0, 65535),
+    "http_connect_timeout": (0.1, 120), "http_read_timeout": (0.1, 300), "http_retries": (0, 10),
+    "http_backoff": (0, 60), "http_pool_per_host": (1, 64), "max_concurrent_fetches": (1, 64),
+    "icon_cache_mb": (1, 1024), "icon_ttl_hours": (0, 8760), "price_source_cooldown": (0, 3600),
+}
+SETTINGS_CHOICES = {
+    "display_mode": DISPLAY_MODES,
+    "stream_kind": ("miniTicker", "bookTicker"),
+    "price_source_mode": ("failover", "race"),
+}
 
-def load_settings():
-    if os.path.exists(SETTINGS_FILE):
+def _migrate_legacy_symbols(loaded: dict):
+    # settings written before the watchlist existed carry symbol1..3 / decimals1..3
+    legacy = [k for k in ("symbol1", "symbol2", "symbol3") if k in loaded]
+    if legacy and "watchlist" not in loaded:
+        loaded["watchlist"] = [
+            {"symbol": loaded[k], "decimals": loaded.get(f"decimals{k[-1]}", 2)} for k in legacy
+        ]
+    for i in (1, 2, 3):
+        loaded.pop(f"symbol{i}", None)
+        loaded.pop(f"decimals{i}", None)
+
+def _coerce_setting(key, value, default):
+    # same type as the default, clamped to SETTINGS_LIMITS; raises ValueError/TypeError when unusable
+    if isinstance(default, bool):
+        if isinstance(value, bool) or value in (0, 1):
+            return bool(value)
+        raise TypeError("expected true/false")
+    if isinstance(default, (int, float)):
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise TypeError("expected a number")
+        value = float(value)
+        if not math.isfinite(value):
+            raise ValueError("expected a finite number")
+        value = int(value) if isinstance(default, int) else value
+        low, high = SETTINGS_LIMITS.get(key, (value, value))
+        return min(high, max(low, value))
+    if isinstance(default, str):
+        value = str(value)
+        if key in SETTINGS_CHOICES and value not in SETTINGS_CHOICES[key]:
+            raise ValueError(f"expected one of {', '.join(SETTINGS_CHOICES[key])}")
+        return value
+    if isinstance(default, list):
+        if not isinstance(value, list):
+            raise TypeError("expected a list")
+        return value
+    return value
+
+def _watchlist_entry_ok(entry) -> bool:
+    if isinstance(entry, dict):
+        return isinstance(entry.get("symbol"), str)
+    return isinstance(entry, (list, tuple)) and len(entry) == 2 and isinstance(entry[0], str)
+
+def validate_settings(loaded: dict):
+    # -> (clean settings, problems); unknown keys pass through untouched
+    clean, problems = {}, []
+    for key, value in loaded.items():
+        default = DEFAULT_CONFIG.get(key)
+        if default is None:
+            clean[key] = value
+            continue
         try:
-            with open(SETTINGS_FILE, "r") as f:
-                loaded = json.load(f)
-                config.update(loaded)
-        except Exception:
-            pass
+            clean[key] = _coerce_setting(key, value, default)
+        except (TypeError, ValueError, OverflowError) as e:
+            problems.append(f"{key}: {e}")
+    if "watchlist" in clean:
+        entries = Watchlist.normalize_entries(e for e in clean["watchlist"] if _watchlist_entry_ok(e))
+        clean["watchlist"] = [{"symbol": sym, "decimals": dec} for sym, dec in entries]
+        if not entries:
+            problems.append("watchlist: no usable symbols")
+            del clean["watchlist"]
+    if "price_sources" in clean:
+        clean["price_sources"] = [n for n in clean["price_sources"]
+                                  if isinstance(n, str) and n in PRICE_SOURCES] or ["binance"]
+    if "alerts" in clean:
+        rules = []
+        for i, entry in enumerate(clean["alerts"]):
+            try:
+                if not isinstance(entry, dict):
+                    raise TypeError("expected an object")
+                rules.append(AlertRule.from_dict(entry).to_dict())
+            except (TypeError, ValueError, OverflowError) as e:
+                problems.append(f"alerts[{i}]: {e}")
+        clean["alerts"] = rules
+    return clean, problems
+
+def migrate_settings(loaded: dict) -> dict:
+    version = loaded.get("settings_version", 1) if isinstance(loaded.get("settings_version"), int) else 1
+    if version < 2:
+        _migrate_legacy_symbols(loaded)
+    loaded["settings_version"] = DEFAULT_CONFIG["settings_version"]
+    return loaded
+
+class SettingsStore:
+    # Owns SETTINGS_FILE. Changes are snapshotted on the caller's thread, coalesced for
+    # `debounce` seconds (never longer than `max_delay`) and written atomically by one
+    # background thread, so dragging the widget or flipping options never blocks painting.
+    def __init__(self, path: str, data: dict, debounce: float = 0.5, max_delay: float = 3.0):
+        self.path = path
+        self.data = data
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.problems = []
+        self.last_error = ""
+        self.counters = {"requests": 0, "writes": 0, "skipped": 0, "reloads": 0}
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending = None
+        self._first = self._deadline = 0.0
+        self._on_disk = None
+        self._thread = None
+
+    def _read(self) -> Optional[bytes]:
+        try:
+            with open(self.path, "rb") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def load(self, quarantine: bool = True) -> set:
+        # returns the keys whose values changed
+        raw = self._read()
+        self._on_disk = raw
+        if raw is None:
+            return set()
+        try:
+            loaded = json.loads(raw)
+            if not isinstance(loaded, dict):
+                raise ValueError("settings must be a JSON object")
+        except ValueError as e:
+            self.problems = [f"unreadable settings file: {e}"]
+            if not quarantine:
+                # a half-finished hand edit: keep running on the current settings
+                sys.stderr.write(f"crypto-widget: {self.problems[0]}; keeping current settings\n")
+                return set()
+            # keep the broken file for inspection instead of overwriting it on the next save
+            try:
+                os.replace(self.path, self.path + ".corrupt")
+            except OSError:
+                pass
+            sys.stderr.write(f"crypto-widget: {self.problems[0]}; using defaults\n")
+            return set()
+        clean, self.problems = validate_settings(migrate_settings(loaded))
+        for problem in self.problems:
+            sys.stderr.write(f"crypto-widget: settings {problem}; using default\n")
+        changed = {k for k, v in clean.items() if self.data.get(k) != v}
+        self.data.update(clean)
+        return changed
+
+    def reload_if_changed(self) -> set:
+        # for file-watcher events: our own writes and no-op touches are ignored
+        raw = self._read()
+        if raw is None or raw == self._on_disk:
+            return set()
+        self.counters["reloads"] += 1
+        return self.load(quarantine=False)
+
+    def update(self, values: dict) -> set:
+        changed = {k for k, v in values.items() if self.data.get(k) != v}
+        if changed:
+            self.data.update(values)
+            self.request_save()
+        return changed
+
+    def request_save(self):
+        snapshot = json.dumps(self.data, indent=2).encode()
+        now = time.monotonic()
+        with self._cond:
+            if self._pending is None:
+                self._first = now
+            self._pending = snapshot
+            self._deadline = now + self.debounce
+            self.counters["requests"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                # trailing debounce, capped so a constant stream of edits still lands on disk
+                while self._pending is not None:
+                    wait = min(self._deadline, self._first + self.max_delay) - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                data, self._pending = self._pending, None
+            if data is not None:
+                self._write(data)
+
+    def _write(self, data: bytes):
+        with self._write_lock:
+            if data == self._on_disk:
+                self.counters["skipped"] += 1
+                return
+            try:
+                write_atomic(self.path, data)
+                self._on_disk = data
+                self.counters["writes"] += 1
+            except OSError as e:
+                self.last_error = str(e)
+
+    def flush(self):
+        with self._cond:
+            data, self._pending = self._pending, None
+        if data is not None:
+            self._write(data)
+
+settings_store = SettingsStore(SETTINGS_FILE, config)
+atexit.register(settings_store.flush)
+
+def load_settings() -> set:
+    return settings_store.load()
 
 def save_settings():
+    settings_store.request_save()
+
+# ---------- Startup Timing ----------
+class StartupTimer:
+    # milestones in ms since this module started loading; CRYPTO_WIDGET_TIMING=1 echoes them
+    def __init__(self, origin: float):
+        self.origin = origin
+        self.marks = {}
+
+    def mark(self, name: str):
+        if name in self.marks:
+            return
+        self.marks[name] = round((time.perf_counter() - self.origin) * 1000, 1)
+        if os.environ.get("CRYPTO_WIDGET_TIMING"):
+            sys.stderr.write(f"startup: {name} {self.marks[name]:.1f} ms\n")
+
+    def snapshot(self) -> dict:
+        return dict(self.marks)
+
+startup = StartupTimer(_T0)
+
+# ---------- Metrics ----------
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+FRAME_BUCKETS = (1, 5, 10, 15, 20, 25, 30, 40, 60, 90, 120)
+
+class Histogram:
+    # fixed buckets, Prometheus-style: counts[i] holds values <= bounds[i], the last one the overflow
+    __slots__ = ("bounds", "counts", "count", "total")
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        # upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        cumulative, running = {}, 0
+        for bound, c in zip(self.bounds + ("+Inf",), self.counts):
+            running += c
+            cumulative[str(bound)] = running
+        return {"count": self.count, "sum": round(self.total, 3),
+                "mean": round(self.total / self.count, 3) if self.count else None,
+                "p50": self.quantile(0.5), "p95": self.quantile(0.95), "buckets": cumulative}
+
+class MetricsRegistry:
+    # Counters, gauges and histograms keyed by (name, labels). Safe to update from any
+    # thread; the GUI publishes widget-side gauges on a timer so readers never touch Qt state.
+    PREFIX = "crypto_widget_"
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((labels or {}).items()))
+
+    def inc(self, name: str, labels: Optional[dict] = None, value: float = 1):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Optional[dict] = None):
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[dict] = None, buckets=LATENCY_BUCKETS_MS):
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def counter_total(self, name: str, **match) -> float:
+        # summed over every label set that matches the given labels
+        with self._lock:
+            return sum(v for (n, labels), v in self._counters.items()
+                       if n == name and all(dict(labels).get(k) == m for k, m in match.items()))
+
+    def merged_histogram(self, name: str) -> Optional[Histogram]:
+        with self._lock:
+            hists = [h for (n, _), h in self._histograms.items() if n == name]
+            if not hists:
+                return None
+            merged = Histogram(hists[0].bounds)
+            for h in hists:
+                merged.counts = [a + b for a, b in zip(merged.counts, h.counts)]
+                merged.count += h.count
+                merged.total += h.total
+            return merged
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = [{"name": n, "labels": dict(l), "value": v} for (n, l), v in self._counters.items()]
+            gauges = [{"name": n, "labels": dict(l), "value": v} for (n, l), v in self._gauges.items()]
+            hists = [dict({"name": n, "labels": dict(l)}, **h.snapshot()) for (n, l), h in self._histograms.items()]
+        return {"timestamp": time.time(), "counters": counters, "gauges": gauges, "histograms": hists}
+
+    @staticmethod
+    def _labels(labels, extra=()) -> str:
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+    def prometheus(self) -> str:
+        lines, typed = [], set()
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+        with self._lock:
+            for (n, l), v in sorted(self._counters.items()):
+                declare(self.PREFIX + n, "counter")
+                lines.append(f"{self.PREFIX}{n}{self._labels(l)} {v:g}")
+            for (n, l), v in sorted(self._gauges.items()):
+                declare(self.PREFIX + n, "gauge")
+                lines.append(f"{self.PREFIX}{n}{self._labels(l)} {v:g}")
+            for (n, l), h in sorted(self._histograms.items()):
+                name = self.PREFIX + n
+                declare(name, "histogram")
+                running = 0
+                for bound, c in zip(h.bounds + ("+Inf",), h.counts):
+                    running += c
+                    lines.append(f"{name}_bucket{self._labels(l, [('le', bound)])} {running}")
+                lines.append(f"{name}_sum{self._labels(l)} {h.total:g}")
+                lines.append(f"{name}_count{self._labels(l)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+class MetricsServer:
+    # loopback-only export: /metrics is Prometheus text, /metrics.json the full snapshot
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 47712):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path in ("/", "/metrics.json"):
+                    body, ctype = json.dumps(registry.snapshot()).encode(), "application/json"
+                elif path == "/metrics":
+                    body, ctype = registry.prometheus().encode(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+# ---------- Watchlist Model ----------
+# longest first, so e.g. FDUSD wins over USD
+QUOTE_ASSETS = ("FDUSD", "USDT", "USDC", "BUSD", "TUSD", "DAI", "USD", "EUR", "TRY", "BTC", "ETH", "BNB")
+
+def split_symbol(symbol: str):
+    # "BTCUSDT", "btc-usdt" and "BTC/USDT" all map to ("BTC", "USDT")
+    symbol = str(symbol).strip().upper()
+    for sep in ("-", "/", "_"):
+        if sep in symbol:
+            base, _, quote = symbol.partition(sep)
+            return base, quote
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)], quote
+    return symbol, ""
+
+def canonical_symbol(symbol: str) -> str:
+    return "".join(split_symbol(symbol))
+
+class SlideRecord:
+    __slots__ = ("symbol", "base", "decimals", "price", "prev_price", "icon_key", "stale")
+    def __init__(self, symbol: str, decimals: int):
+        self.symbol = symbol
+        self.base = split_symbol(symbol)[0]
+        self.decimals = decimals
+        self.price = None
+        self.prev_price = None
+        self.icon_key = self.base.upper()
+        self.stale = False
+
+class Watchlist:
+    # ordered records plus a symbol index; edits keep existing records (price, icon) alive
+    MAX_DECIMALS = 8
+    def __init__(self, entries=()):
+        self._records = []
+        self._index = {}
+        self.set_entries(entries)
+
+    def __len__(self):
+        return len(self._records)
+    def __iter__(self):
+        return iter(self._records)
+    def __contains__(self, symbol):
+        return symbol in self._index
+    def get(self, symbol) -> Optional[SlideRecord]:
+        return self._index.get(symbol)
+    def at(self, index: int) -> SlideRecord:
+        return self._records[index]
+    def slice(self, start: int, stop: int) -> list:
+        return self._records[start:stop]
+    def position(self, symbol) -> int:
+        record = self._index.get(symbol)
+        return self._records.index(record) if record is not None else -1
+    @property
+    def symbols(self) -> list:
+        return list(self._index)
+
+    @staticmethod
+    def normalize_entries(entries) -> list:
+        out, seen = [], set()
+        for entry in entries:
+            if isinstance(entry, dict):
+                symbol, decimals = entry.get("symbol", ""), entry.get("decimals", 2)
+            else:
+                symbol, decimals = entry
+            symbol = canonical_symbol(symbol)
+            if not symbol or symbol in seen:
+                continue
+            try:
+                decimals = min(Watchlist.MAX_DECIMALS, max(0, int(decimals)))
+            except (TypeError, ValueError, OverflowError):
+                decimals = 2
+            seen.add(symbol)
+            out.append((symbol, decimals))
+        return out
+
+    def set_entries(self, entries):
+        # returns (added, removed) symbol lists; untouched symbols keep their state
+        wanted = self.normalize_entries(entries)
+        wanted_symbols = {symbol for symbol, _ in wanted}
+        removed = [s for s in self._index if s not in wanted_symbols]
+        for symbol in removed:
+            del self._index[symbol]
+        added = []
+        records = []
+        for symbol, decimals in wanted:
+            record = self._index.get(symbol)
+            if record is None:
+                record = SlideRecord(symbol, decimals)
+                self._index[symbol] = record
+                added.append(symbol)
+            record.decimals = decimals
+            records.append(record)
+        self._records = records
+        self._index = {r.symbol: r for r in records}
+        return added, removed
+
+    def to_config(self) -> list:
+        return [{"symbol": r.symbol, "decimals": r.decimals} for r in self._records]
+
+def watchlist_entries() -> list:
+    return Watchlist.normalize_entries(config.get("watchlist") or []) or \
+        Watchlist.normalize_entries(DEFAULT_CONFIG["watchlist"])
+
+# ---------- Price History ----------
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    # imported on first use; history stats fall back to plain Python over the same arrays
     try:
-        with open(SETTINGS_FILE, "w") as f:
-            json.dump(config, f, indent=4)
-    except Exception:
-        pass
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+class PriceHistory:
+    # Fixed-size ring of (timestamp, price) in two array('d') buffers, so memory per
+    # symbol is capacity*16 bytes however long the widget runs. Samples closer together
+    # than span/capacity share a slot, keeping the newest price for that slot.
+    __slots__ = ("capacity", "spacing", "version", "_ts", "_px", "_head", "_count", "_slot_start")
+    def __init__(self, capacity: int = 720, span: float = 24 * 3600):
+        self.capacity = max(2, int(capacity))
+        self.spacing = span / self.capacity
+        self.version = 0
+        self._ts = array("d", bytes(8 * self.capacity))
+        self._px = array("d", bytes(8 * self.capacity))
+        self._head = 0
+        self._count = 0
+        self._slot_start = 0.0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, ts: float, price: float):
+        if self._count and ts - self._slot_start < self.spacing:
+            last = (self._head - 1) % self.capacity
+            self._ts[last] = ts
+            self._px[last] = price
+        else:
+            self._ts[self._head] = ts
+            self._px[self._head] = price
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self._slot_start = ts
+        self.version += 1
+
+    def last(self) -> Optional[float]:
+        return self._px[(self._head - 1) % self.capacity] if self._count else None
+
+    def series(self, seconds: Optional[float] = None):
+        # chronological (timestamps, prices), optionally limited to the trailing window
+        h, n = self._head, self._count
+        np = _numpy()
+        if np is not None:
+            ts = np.frombuffer(self._ts, dtype=np.float64)
+            px = np.frombuffer(self._px, dtype=np.float64)
+            if n < self.capacity:
+                ts, px = ts[:n], px[:n]
+            else:
+                ts, px = np.concatenate((ts[h:], ts[:h])), np.concatenate((px[h:], px[:h]))
+            if seconds is not None and n:
+                first = int(np.searchsorted(ts, ts[-1] - seconds))
+                ts, px = ts[first:], px[first:]
+            return ts, px
+        if n < self.capacity:
+            ts, px = self._ts[:n], self._px[:n]
+        else:
+            ts, px = self._ts[h:] + self._ts[:h], self._px[h:] + self._px[:h]
+        if seconds is not None and n:
+            first = bisect_right(ts, ts[-1] - seconds - 1e-9)
+            ts, px = ts[first:], px[first:]
+        return ts, px
+
+    def price_at(self, ts: float) -> Optional[float]:
+        # newest price at or before ts; None when the ring does not reach back that far
+        n = self._count
+        start = (self._head - n) % self.capacity
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[(start + mid) % self.capacity] <= ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._px[(start + lo - 1) % self.capacity] if lo else None
+
+    def change_pct(self, seconds: Optional[float] = None) -> Optional[float]:
+        _, px = self.series(seconds)
+        if len(px) < 2 or px[0] == 0:
+            return None
+        return (float(px[-1]) - float(px[0])) / float(px[0]) * 100.0
+
+    def sparkline(self, points: int, seconds: Optional[float] = None) -> list:
+        # bucket means scaled to 0..1, oldest first
+        _, px = self.series(seconds)
+        n = len(px)
+        if n < 2:
+            return []
+        points = max(2, min(points, n))
+        np = _numpy()
+        if np is not None:
+            edges = np.linspace(0, n, points + 1).astype(np.intp)
+            values = np.add.reduceat(px, edges[:-1]) / np.diff(edges)
+            low, high = values.min(), values.max()
+            span = high - low
+            return ((values - low) / span).tolist() if span else [0.5] * points
+        edges = [n * i // points for i in range(points + 1)]
+        values = [sum(px[a:b]) / (b - a) for a, b in zip(edges, edges[1:])]
+        low, high = min(values), max(values)
+        span = high - low
+        return [(v - low) / span for v in values] if span else [0.5] * points
+
+# ---------- Price Alerts ----------
+ALERT_KINDS = ("above", "below", "cross_above", "cross_below", "move_pct")
+ALERT_ACTIONS = ("flash", "notify", "both")
+
+class AlertRule:
+    # above/below are zone alerts: the first price seen already inside the zone fires too.
+    # cross_* only fire on a crossing between two observed prices. move_pct fires when the
+    # change over the trailing window reaches pct (negative pct: a drop).
+    __slots__ = ("id", "symbol", "kind", "value", "window", "action", "cooldown", "once", "enabled", "last_fired")
+    def __init__(self, symbol, kind, value, window=3600.0, action="flash", cooldown=60.0,
+                 once=False, enabled=True, rule_id=None):
+        if kind not in ALERT_KINDS:
+            raise ValueError(f"kind: expected one of {', '.join(ALERT_KINDS)}")
+        if action not in ALERT_ACTIONS:
+            raise ValueError(f"action: expected one of {', '.join(ALERT_ACTIONS)}")
+        value, window = float(value), float(window)
+        if not math.isfinite(value) or (kind == "move_pct" and value == 0) or (kind != "move_pct" and value <= 0):
+            raise ValueError("value out of range")
+        if not math.isfinite(window):
+            raise ValueError("window out of range")
+        self.symbol = canonical_symbol(symbol)
+        if not self.symbol:
+            raise ValueError("symbol is empty")
+        self.kind = kind
+        self.value = value
+        self.window = max(60.0, window)
+        self.action = action
+        self.cooldown = max(0.0, float(cooldown))
+        self.once = bool(once)
+        self.enabled = bool(enabled)
+        self.last_fired = None
+        self.id = str(rule_id) if rule_id else self.default_id()
+
+    def default_id(self) -> str:
+        return f"{self.symbol}:{self.kind}:{self.value:g}" + (f"/{self.window / 60:g}m" if self.kind == "move_pct" else "")
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        kind = d.get("kind")
+        if kind not in ALERT_KINDS:
+            raise ValueError(f"kind: expected one of {', '.join(ALERT_KINDS)}")
+        value = d.get("pct") if kind == "move_pct" else d.get("price")
+        if value is None or isinstance(value, bool):
+            raise ValueError("pct is required" if kind == "move_pct" else "price is required")
+        return cls(str(d.get("symbol", "")), kind, value, float(d.get("window_minutes", 60)) * 60,
+                   d.get("action", "flash"), d.get("cooldown", 60), d.get("once", False),
+                   d.get("enabled", True), d.get("id"))
+
+    def to_dict(self) -> dict:
+        # derived ids are left out, so editing a rule's level does not leave a stale id behind
+        d = {"id": self.id} if self.id.split("#")[0] != self.default_id() else {}
+        d.update(symbol=self.symbol, kind=self.kind)
+        if self.kind == "move_pct":
+            d["pct"] = self.value
+            d["window_minutes"] = self.window / 60
+        else:
+            d["price"] = self.value
+        d.update(action=self.action, cooldown=self.cooldown, once=self.once, enabled=self.enabled)
+        return d
+
+    @property
+    def rising(self) -> bool:
+        return self.kind in ("above", "cross_above") or (self.kind == "move_pct" and self.value > 0)
+
+    def describe(self, price: float, change: Optional[float] = None) -> str:
+        if self.kind == "move_pct":
+            return f"{self.symbol} moved {change:+.2f}% in {self.window / 60:g} min (now {price:g})"
+        words = {"above": "is above", "below": "is below", "cross_above": "crossed above", "cross_below": "crossed below"}
+        return f"{self.symbol} {words[self.kind]} {self.value:g} (now {price:g})"
+
+class _LevelIndex:
+    # levels kept sorted with their rules alongside, so a move only bisects to its boundaries
+    __slots__ = ("levels", "rules")
+    def __init__(self):
+        self.levels = []
+        self.rules = []
+
+    def add(self, level: float, rule: AlertRule):
+        i = bisect_right(self.levels, level)
+        self.levels.insert(i, level)
+        self.rules.insert(i, rule)
+
+    def remove(self, rule: AlertRule):
+        i = self.rules.index(rule)
+        del self.levels[i]
+        del self.rules[i]
+
+    def rising(self, low, high):
+        # levels in (low, high]; low None: everything up to high
+        start = 0 if low is None else bisect_right(self.levels, low)
+        return self.rules[start:bisect_right(self.levels, high)]
+
+    def falling(self, high, low):
+        # levels in [low, high); high None: everything from low up
+        end = len(self.levels) if high is None else bisect_left(self.levels, high)
+        return self.rules[bisect_left(self.levels, low):end]
+
+class AlertEngine:
+    # Rules are indexed by symbol, and per symbol by direction: rising rules (above,
+    # cross_above, positive move_pct) and falling ones each sit in a sorted level index.
+    # A tick from prev to price visits only the levels between the two, so the cost per
+    # tick follows the rules actually crossed, not how many rules exist.
+    def __init__(self, rules=()):
+        self.counters = {"ticks": 0, "checked": 0, "fired": 0, "suppressed": 0}
+        self._last = {}
+        self._last_move = {}
+        self.set_rules(rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def set_rules(self, rules):
+        # last prices are kept, so reloading the rules does not re-fire zones already entered;
+        # symbols that gained a rule start over, so a new zone rule sees its first price
+        known = getattr(self, "rules", {})
+        self.rules = {}
+        self._up = {}
+        self._down = {}
+        self._moves = {}
+        for rule in rules:
+            self.add(rule)
+            if rule.id in known:
+                rule.last_fired = known[rule.id].last_fired
+        self.forget({r.symbol for r in self.rules.values() if r.id not in known})
+
+    def add(self, rule: AlertRule) -> AlertRule:
+        base, n = rule.id, 1
+        while rule.id in self.rules:
+            n += 1
+            rule.id = f"{base}#{n}"
+        self.rules[rule.id] = rule
+        if rule.enabled:
+            self._index(rule).add(rule.value, rule)
+        return rule
+
+    def remove(self, rule_id: str):
+        rule = self.rules.pop(rule_id, None)
+        if rule is not None and rule.enabled:
+            self._index(rule).remove(rule)
+        return rule
+
+    def disable(self, rule: AlertRule):
+        if rule.enabled:
+            self._index(rule).remove(rule)
+            rule.enabled = False
+
+    def symbols(self) -> set:
+        return set(self._up) | set(self._down) | set(self._moves)
+
+    def _index(self, rule: AlertRule) -> _LevelIndex:
+        if rule.kind == "move_pct":
+            pair = self._moves.setdefault(rule.symbol, {}).setdefault(rule.window, (_LevelIndex(), _LevelIndex()))
+            return pair[0] if rule.rising else pair[1]
+        table = self._up if rule.rising else self._down
+        return table.setdefault(rule.symbol, _LevelIndex())
+
+    def evaluate(self, symbol: str, price: float, now: float, history: Optional[PriceHistory] = None) -> list:
+        # -> [(rule, message)] for the rules this tick fires
+        self.counters["ticks"] += 1
+        fired = []
+        prev = self._last.get(symbol)
+        self._last[symbol] = price
+        if prev is None:
+            # first price: zone rules fire if already inside, crossings need a second price
+            self._fire([r for r in self._up[symbol].rising(None, price) if r.kind == "above"]
+                       if symbol in self._up else (), price, None, now, fired)
+            self._fire([r for r in self._down[symbol].falling(None, price) if r.kind == "below"]
+                       if symbol in self._down else (), price, None, now, fired)
+        elif price > prev and symbol in self._up:
+            self._fire(self._up[symbol].rising(prev, price), price, None, now, fired)
+        elif price < prev and symbol in self._down:
+            self._fire(self._down[symbol].falling(prev, price), price, None, now, fired)
+        moves = self._moves.get(symbol)
+        if moves and history is not None:
+            for window, (up, down) in moves.items():
+                ref = history.price_at(now - window)
+                if not ref:
+                    continue
+                change = (price - ref) / ref * 100.0
+                last = self._last_move.get((symbol, window))
+                self._last_move[(symbol, window)] = change
+                if last is None or change > last:
+                    self._fire(up.rising(last, change), price, change, now, fired)
+                if last is None or change < last:
+                    self._fire(down.falling(last, change), price, change, now, fired)
+        return fired
+
+    def _fire(self, rules, price, change, now, fired):
+        if not rules:
+            return
+        self.counters["checked"] += len(rules)
+        for rule in rules:
+            # the cooldown keeps a price hovering around a level from firing on every tick
+            if rule.last_fired is not None and now - rule.last_fired < rule.cooldown:
+                self.counters["suppressed"] += 1
+                continue
+            rule.last_fired = now
+            self.counters["fired"] += 1
+            fired.append((rule, rule.describe(price, change)))
+            if rule.once:
+                self.disable(rule)
+
+    def forget(self, symbols):
+        for symbol in symbols:
+            self._last.pop(symbol, None)
+        for key in [k for k in self._last_move if k[0] in symbols]:
+            del self._last_move[key]
+
+    def stats(self) -> dict:
+        return dict(self.counters, rules=len(self.rules), symbols=len(self.symbols()))
+
+# ---------- Tick Store ----------
+class _FileLock:
+    # advisory lock on a side file, held while one process touches a shared store
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = None
+
+    def __enter__(self):
+        self._fh = open(self.path, "a+b")
+        if os.name == "nt":
+            import msvcrt
+            self._fh.seek(0)
+            msvcrt.locking(self._fh.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if os.name == "nt":
+                import msvcrt
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+class TickStore:
+    # Append-only file of fixed-width (symbol id, timestamp, price) records behind a small
+    # header; symbol ids live in a JSON sidecar. Appends are buffered in memory and
+    # written in batches by flush(), which is meant to run off the GUI thread.
+    # Several processes (widgets, the daemon) may share the files: ids are only handed
+    # out in flush(), under a file lock, after re-reading the sidecar, so every process
+    # agrees on them.
+    MAGIC = b"CWTK"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHH8x")
+    RECORD = struct.Struct("<Hdd")
+    def __init__(self, path: str, retention_hours: float = 72, max_bytes: int = 32 * 1024 * 1024,
+                 min_interval: float = 60):
+        self.path = path
+        self.symbols_path = os.path.splitext(path)[0] + ".json"
+        self.lock_path = os.path.splitext(path)[0] + ".lock"
+        self.retention = retention_hours * 3600
+        self.max_bytes = max_bytes
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending = []
+        self._tail = {}
+        self._last_ts = {}
+        with self._io_lock, _FileLock(self.lock_path):
+            self._repair()
+
+    def _read_ids(self) -> dict:
+        try:
+            with open(self.symbols_path, "r") as f:
+                symbols = json.load(f).get("symbols", [])
+        except Exception:
+            symbols = []
+        return {str(s): i for i, s in enumerate(symbols)}
+
+    def _repair(self):
+        # a crash mid-write can leave a partial record; trim it so appends stay aligned
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        body = size - self.HEADER.size
+        if body < 0 or not self._valid_header():
+            os.remove(self.path)
+        elif body % self.RECORD.size:
+            with open(self.path, "r+b") as f:
+                f.truncate(size - body % self.RECORD.size)
+
+    def _valid_header(self) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                magic, version, _ = self.HEADER.unpack(f.read(self.HEADER.size))
+            return magic == self.MAGIC and version == self.VERSION
+        except (OSError, struct.error):
+            return False
+
+    def append(self, symbol: str, ts: float, price: float):
+        # cheap enough for the GUI thread: one record per symbol per min_interval
+        with self._lock:
+            last = self._last_ts.get(symbol)
+            if last is not None and ts - last < self.min_interval:
+                self._tail[symbol] = (ts, price)
+                return
+            self._last_ts[symbol] = ts
+            self._tail.pop(symbol, None)
+            self._pending.append((symbol, ts, price))
+
+    def flush(self, final: bool = False):
+        # final also writes the newest tick of each throttled symbol, so a restart shows it
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if final:
+                batch.extend((symbol, ts, price) for symbol, (ts, price) in self._tail.items())
+                self._tail.clear()
+        if not batch:
+            return
+        with self._io_lock, _FileLock(self.lock_path):
+            # the sidecar only ever grows, so ids another process handed out stay valid
+            ids = self._read_ids()
+            added = [sym for sym in dict.fromkeys(sym for sym, _, _ in batch) if sym not in ids]
+            if added:
+                for sym in added:
+                    ids[sym] = len(ids)
+                write_atomic(self.symbols_path, json.dumps({"symbols": list(ids)}).encode())
+            new_file = not os.path.exists(self.path)
+            with open(self.path, "ab") as f:
+                if new_file:
+                    f.write(self.HEADER.pack(self.MAGIC, self.VERSION, 0))
+                f.write(b"".join(self.RECORD.pack(ids[sym], ts, price) for sym, ts, price in batch))
+            if os.path.getsize(self.path) > self.max_bytes or self._oldest_ts() < time.time() - self.retention * 1.25:
+                self._compact()
+
+    def _count(self, mm) -> int:
+        return (len(mm) - self.HEADER.size) // self.RECORD.size
+
+    def _offset(self, index: int) -> int:
+        return self.HEADER.size + index * self.RECORD.size
+
+    def _open_map(self):
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < self.HEADER.size + self.RECORD.size:
+                    return None
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+    def _oldest_ts(self) -> float:
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.HEADER.size)
+                return self.RECORD.unpack(f.read(self.RECORD.size))[1]
+        except (OSError, struct.error):
+            return time.time()
+
+    def _first_at_or_after(self, mm, count: int, cutoff: float) -> int:
+        # records are appended in time order, so the window start can be bisected
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.RECORD.unpack_from(mm, self._offset(mid))[1] < cutoff:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _compact(self):
+        # drop records past retention, then the oldest until the file is well under max_bytes
+        mm = self._open_map()
+        if mm is None:
+            return
+        with mm:
+            count = self._count(mm)
+            keep_max = max(0, (self.max_bytes * 3 // 4 - self.HEADER.size) // self.RECORD.size)
+            first = max(count - keep_max, self._first_at_or_after(mm, count, time.time() - self.retention))
+            body = mm[self._offset(first):self._offset(count)]
+        write_atomic(self.path, self.HEADER.pack(self.MAGIC, self.VERSION, 0) + body)
+
+    def last_prices(self, symbols) -> dict:
+        # scans backwards from the end of the map until every wanted symbol has been seen
+        ids = self._read_ids()
+        wanted = {ids[s]: s for s in symbols if s in ids}
+        found = {}
+        mm = self._open_map() if wanted else None
+        if mm is None:
+            return found
+        with mm:
+            end = self._count(mm)
+            while end > 0 and len(found) < len(wanted):
+                start = max(0, end - 4096)
+                chunk = list(self.RECORD.iter_unpack(mm[self._offset(start):self._offset(end)]))
+                for sid, ts, price in reversed(chunk):
+                    symbol = wanted.get(sid)
+                    if symbol is not None and symbol not in found:
+                        found[symbol] = (ts, price)
+                end = start
+        return found
+
+    def replay(self, symbols, seconds: float) -> dict:
+        # symbol -> chronological [(ts, price)] within the trailing window
+        ids = self._read_ids()
+        wanted = {ids[s]: s for s in symbols if s in ids}
+        out = {s: [] for s in wanted.values()}
+        mm = self._open_map() if wanted else None
+        if mm is None:
+            return out
+        with mm:
+            count = self._count(mm)
+            first = self._first_at_or_after(mm, count, time.time() - seconds)
+            for sid, ts, price in self.RECORD.iter_unpack(mm[self._offset(first):self._offset(count)]):
+                symbol = wanted.get(sid)
+                if symbol is not None:
+                    out[symbol].append((ts, price))
+        return out
+
+# ---------- HTTP Transport ----------
+class ConnectionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = {}
+    def _bump(self, host, key):
+        with self._lock:
+            counts = self._hosts.setdefault(host, {"opened": 0, "checkouts": 0})
+            counts[key] += 1
+    def record_open(self, host):
+        self._bump(host, "opened")
+    def record_checkout(self, host):
+        self._bump(host, "checkouts")
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                host: {"opened": c["opened"], "requests": c["checkouts"],
+                       "reused": max(0, c["checkouts"] - c["opened"])}
+                for host, c in self._hosts.items()
+            }
+
+def _counting_pool(base, stats: ConnectionStats):
+    class CountingPool(base):
+        def _new_conn(self):
+            stats.record_open(self.host)
+            return super()._new_conn()
+        def _get_conn(self, timeout=None):
+            stats.record_checkout(self.host)
+            return super()._get_conn(timeout)
+    return CountingPool
+
+@functools.lru_cache(maxsize=None)
+def _counting_adapter_class():
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class CountingAdapter(HTTPAdapter):
+        def __init__(self, stats: ConnectionStats, **kwargs):
+            self.stats = stats
+            super().__init__(**kwargs)
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": _counting_pool(HTTPConnectionPool, self.stats),
+                "https": _counting_pool(HTTPSConnectionPool, self.stats),
+            }
+    return CountingAdapter
+
+class HttpTransport:
+    # one keep-alive session for every worker, so repeat fetches skip the TCP+TLS handshake
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 6,
+                 retries: int = 2, backoff: float = 0.3, pool_per_host: int = 4):
+        import requests
+        from urllib3.util.retry import Retry
+        self.timeout = (connect_timeout, read_timeout)
+        self.stats = ConnectionStats()
+        # Retry-After is left to the poll scheduler; sleeping on it here would pin a worker thread
+        retry = Retry(total=retries, connect=retries, read=retries, backoff_factor=backoff,
+                      status_forcelist=(500, 502, 503, 504), allowed_methods=("GET",),
+                      raise_on_status=False, respect_retry_after_header=False)
+        adapter = _counting_adapter_class()(self.stats, pool_connections=8, pool_maxsize=pool_per_host,
+                                  pool_block=True, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    def get(self, url: str, timeout=None, **kwargs):
+        host = urlsplit(url).netloc
+        t0 = time.perf_counter()
+        try:
+            r = self.session.get(url, timeout=timeout or self.timeout, **kwargs)
+        except Exception:
+            metrics.inc("http_requests_total", {"host": host, "status": "error"})
+            raise
+        metrics.observe("http_request_ms", (time.perf_counter() - t0) * 1000, {"host": host})
+        metrics.inc("http_requests_total", {"host": host, "status": f"{r.status_code // 100}xx"})
+        return r
+    def connection_stats(self) -> dict:
+        return self.stats.snapshot()
+    def close(self):
+        self.session.close()
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+def reset_transport():
+    # the next request builds a new session from the current config; in-flight ones finish on the old
+    global _transport
+    with _transport_lock:
+        _transport = None
+
+def get_transport() -> HttpTransport:
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport(
+                connect_timeout=float(config.get("http_connect_timeout", 3.05)),
+                read_timeout=float(config.get("http_read_timeout", 6)),
+                retries=int(config.get("http_retries", 2)),
+                backoff=float(config.get("http_backoff", 0.3)),
+                pool_per_host=max(1, int(config.get("http_pool_per_host", 4))),
+            )
+        return _transport
 
 # ---------- Icon & Price Utilities ----------
 def make_fallback_pixmap(symbol_upper: str, size: int = 128) -> QPixmap:
@@ -72,67 +1267,1135 @@ def make_fallback_pixmap(symbol_upper: str, size: int = 128) -> QPixmap:
     return pix
 
 def icon_cache_path(symbol: str) -> str:
-    symbol_upper = symbol.replace("USDT", "").upper()
+    symbol_upper = split_symbol(symbol)[0]
     return os.path.join(ICON_CACHE_DIR, f"{symbol_upper}.png")
 
-def clear_icon_cache():
+def icon_meta_path(symbol: str) -> str:
+    return os.path.splitext(icon_cache_path(symbol))[0] + ".json"
+
+def icon_url(symbol: str) -> str:
+    symbol_upper = split_symbol(symbol)[0]
+    return f"{ICON_BASE_URL.rstrip('/')}/static/assets/logos/{symbol_upper}.png"
+
+def read_icon_meta(symbol: str) -> dict:
     try:
-        for fname in os.listdir(ICON_CACHE_DIR):
-            path = os.path.join(ICON_CACHE_DIR, fname)
-            try:
-                os.remove(path)
-            except Exception:
-                pass
+        with open(icon_meta_path(symbol), "r") as f:
+            meta = json.load(f)
+        return meta if isinstance(meta, dict) else {}
+    except Exception:
+        return {}
+
+def write_icon_meta(symbol: str, meta: dict):
+    try:
+        write_atomic(icon_meta_path(symbol), json.dumps(meta).encode())
     except Exception:
         pass
 
-# ---------- Background Workers ----------
-class PriceWorker(QThread):
-    price_fetched = pyqtSignal(str, object)
-    def __init__(self, symbol: str, parent=None):
-        super().__init__(parent)
-        self.symbol = symbol
-    def run(self):
+def write_atomic(path: str, data: bytes):
+    # readers never see a half-written file: write beside the target, then rename over it
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+class IconCache:
+    # In-memory tier in front of ICON_CACHE_DIR. Holds source pixmaps plus variants
+    # pre-scaled per (size, DPR); least recently used entries go once the byte budget
+    # is exceeded. QPixmap is GUI-thread only, so this is too.
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def __contains__(self, key):
+        return ("src", key) in self._entries
+
+    def put(self, key, pixmap: QPixmap):
+        self.discard(key)
+        self._store(("src", key), pixmap)
+
+    def scaled(self, key, size: int, dpr: float) -> Optional[QPixmap]:
+        entry = ("scaled", key, size, dpr)
+        pix = self._entries.get(entry)
+        if pix is None:
+            src = self._entries.get(("src", key))
+            if src is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(("src", key))
+            px = max(1, round(size * dpr))
+            pix = src.scaled(px, px, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            pix.setDevicePixelRatio(dpr)
+            self._store(entry, pix)
+        else:
+            self._entries.move_to_end(entry)
+        self.hits += 1
+        return pix
+
+    def discard(self, key):
+        for entry in [e for e in self._entries if e[1] == key]:
+            self._bytes -= self._cost(self._entries.pop(entry))
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self._entries), "bytes": self._bytes}
+
+    @staticmethod
+    def _cost(pix: QPixmap) -> int:
+        return pix.width() * pix.height() * 4
+
+    def _store(self, entry, pix: QPixmap):
+        self._entries[entry] = pix
+        self._bytes += self._cost(pix)
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= self._cost(old)
+            self.evictions += 1
+
+icon_cache = IconCache()
+
+def _store_icon(symbol: str, response) -> bytes:
+    data = response.content
+    try:
+        write_atomic(icon_cache_path(symbol), data)
+    except Exception:
+        pass
+    write_icon_meta(symbol, {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    })
+    return data
+
+def _read_cached_icon(symbol: str) -> Optional[bytes]:
+    try:
+        with open(icon_cache_path(symbol), "rb") as fh:
+            data = fh.read()
+    except OSError:
+        return None
+    digest = read_icon_meta(symbol).get("sha256")
+    if digest and hashlib.sha256(data).hexdigest() != digest:
+        return None  # truncated or corrupted on disk; download again
+    return data
+
+def load_icon_images(symbols) -> dict:
+    # runs off the GUI thread, so decode into QImage; QPixmap is built on the GUI thread
+    images = {}
+    for symbol in symbols:
+        images[symbol] = None
+        data = _read_cached_icon(symbol)
+        if data is not None:
+            img = QImage()
+            if img.loadFromData(data):
+                images[symbol] = img
+                continue
         try:
-            url = f"https://api.binance.com/api/v3/ticker/price?symbol={self.symbol.upper()}"
-            r = requests.get(url, timeout=6)
+            r = get_transport().get(icon_url(symbol))
             r.raise_for_status()
-            price = float(r.json().get("price", 0.0))
-            self.price_fetched.emit(self.symbol, price)
+            img = QImage()
+            if img.loadFromData(_store_icon(symbol, r)):
+                images[symbol] = img
         except Exception:
-            self.price_fetched.emit(self.symbol, None)
+            pass
+    return images
 
-class IconWorker(QThread):
-    icon_fetched = pyqtSignal(str, QPixmap)
-    def __init__(self, symbol: str, parent=None):
-        super().__init__(parent)
-        self.symbol = symbol
-    def run(self):
-        symbol_upper = self.symbol.replace("USDT", "").upper()
-        cache_file = icon_cache_path(self.symbol)
-        if os.path.exists(cache_file):
-            pix = QPixmap(cache_file)
-            if not pix.isNull():
-                self.icon_fetched.emit(self.symbol, pix)
-                return
+def revalidate_icons(symbols, force: bool = False) -> dict:
+    # conditional GET for icons past their TTL; only icons whose bytes changed come back
+    ttl = float(config.get("icon_ttl_hours", 24)) * 3600
+    changed = {}
+    for symbol in symbols:
+        meta = read_icon_meta(symbol)
+        if not force and time.time() - float(meta.get("fetched_at", 0)) < ttl:
+            continue
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            r = get_transport().get(icon_url(symbol), headers=headers)
+            if r.status_code == 304:
+                meta["fetched_at"] = time.time()
+                write_icon_meta(symbol, meta)
+                continue
+            r.raise_for_status()
+            if meta.get("sha256") == hashlib.sha256(r.content).hexdigest() and os.path.exists(icon_cache_path(symbol)):
+                # server ignored the validators but the icon is unchanged
+                meta.update(fetched_at=time.time(), etag=r.headers.get("ETag"),
+                            last_modified=r.headers.get("Last-Modified"))
+                write_icon_meta(symbol, meta)
+                continue
+            img = QImage()
+            if img.loadFromData(_store_icon(symbol, r)):
+                changed[symbol] = img
+        except Exception:
+            pass
+    return changed
+
+# ---------- Price Sources ----------
+class RateLimitError(Exception):
+    # prices: whatever other sources priced in the same fetch, so a caller that backs
+    # off still gets to show them
+    def __init__(self, retry_after: float, used_weight: Optional[int] = None, prices: Optional[dict] = None):
+        super().__init__(f"rate limited, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+        self.used_weight = used_weight
+        self.prices = prices or {}
+
+def _note_rate_limit(r, meta: Optional[dict]):
+    weight = r.headers.get("X-MBX-USED-WEIGHT-1M") or r.headers.get("X-MBX-USED-WEIGHT")
+    weight = int(weight) if weight and weight.isdigit() else None
+    if meta is not None and weight is not None:
+        meta["used_weight"] = weight
+    # 429 means back off; 418 means the IP is already banned for Retry-After seconds
+    if r.status_code in (418, 429):
+        try:
+            retry_after = float(r.headers.get("Retry-After") or 60)
+        except ValueError:
+            retry_after = 60.0
+        raise RateLimitError(retry_after, weight)
+
+class PriceSource:
+    # fetch() takes canonical symbols (BTCUSDT) and returns {symbol: price or None};
+    # it raises on transport errors so the router can fail over
+    name = ""
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+    def fetch(self, symbols, timeout=None, meta: Optional[dict] = None) -> dict:
+        raise NotImplementedError
+
+class BinanceSource(PriceSource):
+    name = "binance"
+    def __init__(self, base_url: Optional[str] = None):
+        super().__init__(base_url or BINANCE_API_URL)
+
+    def fetch(self, symbols, timeout=None, meta: Optional[dict] = None) -> dict:
+        # one round trip for the whole watchlist; meta, if given, receives the
+        # request weight the exchange reports as used
+        import requests
+        wanted = {s.upper(): s for s in symbols}
+        prices = {s: None for s in symbols}
+        if not wanted:
+            return prices
+        url = f"{self.base_url}/api/v3/ticker/price"
+        batch = json.dumps(list(wanted), separators=(",", ":"))
         try:
-            url = f"https://bin.bnbstatic.com/static/assets/logos/{symbol_upper}.png"
-            r = requests.get(url, timeout=8)
+            r = get_transport().get(url, params={"symbols": batch}, timeout=timeout)
+            _note_rate_limit(r, meta)
             r.raise_for_status()
-            data = r.content
+            rows = r.json()
+        except requests.HTTPError as e:
+            # a single unknown symbol rejects the whole batch; filter the full snapshot instead
+            if e.response is None or e.response.status_code != 400:
+                raise
+            r = get_transport().get(url, timeout=timeout)
+            _note_rate_limit(r, meta)
+            r.raise_for_status()
+            rows = r.json()
+        for row in rows:
+            symbol = wanted.get(str(row.get("symbol", "")).upper())
+            if symbol is not None:
+                prices[symbol] = float(row.get("price", 0.0))
+        return prices
+
+class OkxSource(PriceSource):
+    name = "okx"
+    def __init__(self, base_url: Optional[str] = None):
+        super().__init__(base_url or OKX_API_URL)
+
+    def fetch(self, symbols, timeout=None, meta: Optional[dict] = None) -> dict:
+        # the spot snapshot is a single request however long the watchlist is
+        import requests
+        wanted = {"-".join(split_symbol(s)): s for s in symbols}
+        prices = {s: None for s in symbols}
+        if not wanted:
+            return prices
+        r = get_transport().get(f"{self.base_url}/api/v5/market/tickers",
+                                params={"instType": "SPOT"}, timeout=timeout)
+        _note_rate_limit(r, meta)
+        r.raise_for_status()
+        body = r.json()
+        if str(body.get("code", "0")) != "0":
+            raise requests.HTTPError(f"okx error {body.get('code')}: {body.get('msg')}", response=r)
+        for row in body.get("data", []):
+            symbol = wanted.get(str(row.get("instId", "")).upper())
+            if symbol is not None and row.get("last") not in (None, ""):
+                prices[symbol] = float(row["last"])
+        return prices
+
+PRICE_SOURCES = {cls.name: cls for cls in (BinanceSource, OkxSource)}
+
+class _SourceState:
+    __slots__ = ("latency", "ok", "errors", "down_until", "rate_limited", "last_error")
+    def __init__(self):
+        self.latency = None
+        self.ok = 0
+        self.errors = 0
+        self.down_until = 0.0
+        self.rate_limited = False
+        self.last_error = ""
+
+class PriceRouter:
+    # Sends each batch to the source with the lowest smoothed latency. In "failover"
+    # mode the next source is tried when one errors or leaves symbols unpriced; in
+    # "race" mode the two best sources are asked at once and the first answer wins.
+    # A failing source sits out for `cooldown` seconds (or its Retry-After) and is not
+    # asked at all until then; if only a rate-limited source could price what is still
+    # missing, its RateLimitError is raised so the caller backs off too.
+    ALPHA = 0.3
+    def __init__(self, sources, mode: str = "failover", cooldown: float = 30):
+        self.sources = list(sources)
+        self.mode = mode
+        self.cooldown = cooldown
+        self._state = {src.name: _SourceState() for src in self.sources}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def ranked(self, now: Optional[float] = None) -> list:
+        # sources that are not cooling down, fastest first; unmeasured ones sort first
+        # so each one gets timed at least once
+        now = time.time() if now is None else now
+        available = [src for src in self.sources if self._state[src.name].down_until <= now]
+        return sorted(available, key=lambda src: self._state[src.name].latency or 0.0)
+
+    def _skipped_error(self, skipped, now: float) -> Exception:
+        # why the skipped sources are out; the longest rate limit wins
+        with self._lock:
+            limited = [self._state[src.name].down_until - now for src in skipped if self._state[src.name].rate_limited]
+        if limited:
+            return RateLimitError(max(limited))
+        return ConnectionError(f"{', '.join(src.name for src in skipped)} cooling down")
+
+    def _call(self, src, symbols, timeout, meta):
+        t0 = time.perf_counter()
+        try:
+            prices = src.fetch(symbols, timeout=timeout, meta=meta)
+        except Exception as e:
+            metrics.inc("source_requests_total", {"source": src.name,
+                        "result": "rate_limited" if isinstance(e, RateLimitError) else "error"})
+            with self._lock:
+                st = self._state[src.name]
+                st.errors += 1
+                st.last_error = str(e)[:200]
+                st.rate_limited = isinstance(e, RateLimitError)
+                wait = e.retry_after if st.rate_limited else self.cooldown
+                st.down_until = time.time() + wait
+            raise
+        elapsed = time.perf_counter() - t0
+        metrics.inc("source_requests_total", {"source": src.name, "result": "ok"})
+        metrics.observe("source_fetch_ms", elapsed * 1000, {"source": src.name})
+        with self._lock:
+            st = self._state[src.name]
+            st.ok += 1
+            st.latency = elapsed if st.latency is None else st.latency + self.ALPHA * (elapsed - st.latency)
+            st.down_until = 0.0
+            st.rate_limited = False
+        return prices
+
+    def fetch(self, symbols, timeout=None, meta: Optional[dict] = None) -> dict:
+        symbols = list(symbols)
+        prices = {s: None for s in symbols}
+        if not symbols:
+            return prices
+        now = time.time()
+        order = self.ranked(now)
+        skipped = [src for src in self.sources if src not in order]
+        error = None
+        if self.mode == "race" and len(order) > 1:
+            order, error = self._race(order, symbols, timeout, meta, prices)
+        for src in order:
+            missing = [s for s in symbols if prices[s] is None]
+            if not missing:
+                break
             try:
-                with open(cache_file, "wb") as fh:
-                    fh.write(data)
-            except Exception:
-                pass
-            pix = QPixmap()
-            if pix.loadFromData(data):
-                self.icon_fetched.emit(self.symbol, pix)
+                got = self._call(src, missing, timeout, meta)
+            except Exception as e:
+                error = e
+                continue
+            for s, price in got.items():
+                if price is not None:
+                    prices[s] = price
+                    if meta is not None:
+                        meta.setdefault("sources", {})[s] = src.name
+        if skipped and any(p is None for p in prices.values()) and not isinstance(error, RateLimitError):
+            # what is still missing could only come from a source that is sitting out
+            reason = self._skipped_error(skipped, now)
+            if isinstance(reason, RateLimitError) or error is None:
+                error = reason
+        if isinstance(error, RateLimitError):
+            error.prices = {s: p for s, p in prices.items() if p is not None}
+            raise error
+        if error is not None and all(p is None for p in prices.values()):
+            raise error
+        return prices
+
+    def _race(self, order, symbols, timeout, meta, prices) -> list:
+        # the loser keeps running in the background so its latency is still measured
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=len(self.sources), thread_name_prefix="price-race")
+        # each call gets its own meta; only a finished call's used weight is passed on
+        pending = {}
+        for src in order[:2]:
+            call_meta = {}
+            pending[self._pool.submit(self._call, src, symbols, timeout, call_meta)] = (src, call_meta)
+        error = None
+        while pending:
+            done, _ = wait_futures(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                src, call_meta = pending.pop(fut)
+                if meta is not None and "used_weight" in call_meta:
+                    meta["used_weight"] = call_meta["used_weight"]
+                error = fut.exception()
+                if error is None:
+                    for s, price in fut.result().items():
+                        if price is not None:
+                            prices[s] = price
+                            if meta is not None:
+                                meta.setdefault("sources", {})[s] = src.name
+                    # whatever is still unpriced falls through to the remaining sources
+                    return [o for o in order if o is not src], None
+        return order[2:], error
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: {"latency_ms": round(st.latency * 1000, 1) if st.latency is not None else None,
+                       "ok": st.ok, "errors": st.errors, "last_error": st.last_error,
+                       "down_for": round(max(0.0, st.down_until - time.time()), 1)}
+                for name, st in self._state.items()
+            }
+
+_router: Optional[PriceRouter] = None
+_router_key = None
+
+def get_price_router() -> PriceRouter:
+    # rebuilt when the configured sources change; latency history is per router
+    global _router, _router_key
+    names = [n for n in config.get("price_sources", ["binance"]) if n in PRICE_SOURCES] or ["binance"]
+    key = (tuple(names), config.get("price_source_mode", "failover"), float(config.get("price_source_cooldown", 30)))
+    with _transport_lock:
+        if _router is None or _router_key != key:
+            _router = PriceRouter([PRICE_SOURCES[n]() for n in names], mode=key[1], cooldown=key[2])
+            _router_key = key
+        return _router
+
+def fetch_prices(symbols, timeout=None, meta: Optional[dict] = None) -> dict:
+    return get_price_router().fetch(symbols, timeout=timeout, meta=meta)
+
+def fetch_prices_with_meta(symbols):
+    meta = {}
+    return fetch_prices(symbols, meta=meta), meta
+
+# ---------- Poll Scheduler ----------
+class _PollState:
+    __slots__ = ("next_due", "failures", "last_ok", "in_flight")
+    def __init__(self):
+        self.next_due = 0.0
+        self.failures = 0
+        self.last_ok = 0.0
+        self.in_flight = False
+
+class PollScheduler:
+    # Decides which symbols to poll and when. Visible symbols refresh every `interval`,
+    # off-screen ones every interval*offscreen_factor; failures back off exponentially
+    # with jitter; the exchange's request-weight and Retry-After headers throttle or
+    # pause polling. Qt-free, so it can drive any fetch loop.
+    WEIGHT_PER_REQUEST = 4
+    def __init__(self, interval: float = 10, offscreen_factor: float = 6, max_backoff: float = 300,
+                 weight_limit: int = 6000, budget: float = 0.5):
+        self.configure(interval, offscreen_factor, max_backoff, weight_limit, budget)
+        self.paused_until = 0.0
+        self.used_weight = 0
+        self._weight_minute = -1
+        self._states = {}
+        self.decisions = deque(maxlen=200)
+        self.counters = {"polls": 0, "symbols_polled": 0, "deferred": 0, "backoffs": 0, "rate_limited": 0}
+
+    def configure(self, interval, offscreen_factor, max_backoff, weight_limit, budget):
+        self.interval = max(1.0, float(interval))
+        self.offscreen_factor = max(1.0, float(offscreen_factor))
+        self.max_backoff = max(self.interval, float(max_backoff))
+        self.weight_limit = max(1, int(weight_limit))
+        self.budget = min(1.0, max(0.05, float(budget)))
+
+    def set_symbols(self, symbols):
+        wanted = set(symbols)
+        for symbol in [s for s in self._states if s not in wanted]:
+            del self._states[symbol]
+        for symbol in symbols:
+            self._states.setdefault(symbol, _PollState())
+
+    def _log(self, now, action, symbols=(), reason=""):
+        self.decisions.append({"ts": round(now, 3), "action": action, "symbols": list(symbols), "reason": reason})
+
+    def current_weight(self, now: float) -> int:
+        # the exchange reports weight per wall-clock minute
+        return self.used_weight if int(now // 60) == self._weight_minute else 0
+
+    def _due_at(self, symbol, st, visible) -> float:
+        if symbol in visible and st.failures == 0:
+            return min(st.next_due, st.last_ok + self.interval)
+        return st.next_due
+
+    def due(self, now: float, visible=()) -> list:
+        if now < self.paused_until:
+            return []
+        over_budget = self.current_weight(now) + self.WEIGHT_PER_REQUEST > self.budget * self.weight_limit
+        out, deferred = [], []
+        for symbol, st in self._states.items():
+            if st.in_flight or self._due_at(symbol, st, visible) > now:
+                continue
+            if over_budget and symbol not in visible:
+                deferred.append(symbol)
+                continue
+            out.append(symbol)
+        if deferred:
+            # off-screen symbols wait for the next weight window
+            next_minute = (int(now // 60) + 1) * 60
+            for symbol in deferred:
+                self._states[symbol].next_due = next_minute
+            self.counters["deferred"] += len(deferred)
+            self._log(now, "defer", deferred, f"weight {self.current_weight(now)}/{self.weight_limit}")
+        if out:
+            self.mark_in_flight(out)
+            self.counters["polls"] += 1
+            self.counters["symbols_polled"] += len(out)
+            self._log(now, "poll", out)
+        return out
+
+    def mark_in_flight(self, symbols):
+        for symbol in symbols:
+            st = self._states.get(symbol)
+            if st is not None:
+                st.in_flight = True
+
+    def record_success(self, symbols, now: float, visible=()):
+        for symbol in symbols:
+            st = self._states.get(symbol)
+            if st is None:
+                continue
+            st.in_flight = False
+            st.failures = 0
+            st.last_ok = now
+            st.next_due = now + (self.interval if symbol in visible else self.interval * self.offscreen_factor)
+
+    def record_failure(self, symbols, now: float, visible=()):
+        backed_off = []
+        for symbol in symbols:
+            st = self._states.get(symbol)
+            if st is None:
+                continue
+            st.in_flight = False
+            st.failures += 1
+            base = self.interval if symbol in visible else self.interval * self.offscreen_factor
+            delay = min(self.max_backoff, base * 2 ** (st.failures - 1))
+            st.next_due = max(self.paused_until, now + random.uniform(delay / 2, delay))
+            backed_off.append(symbol)
+        if backed_off:
+            self.counters["backoffs"] += len(backed_off)
+            self._log(now, "backoff", backed_off)
+
+    def note_weight(self, used_weight: Optional[int], now: float):
+        if used_weight is not None:
+            self.used_weight = used_weight
+            self._weight_minute = int(now // 60)
+
+    def pause(self, seconds: float, now: float):
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.counters["rate_limited"] += 1
+        self._log(now, "pause", (), f"retry after {seconds:.0f}s")
+
+    def next_wakeup(self, now: float, visible=()) -> Optional[float]:
+        # seconds until something is due, or None when nothing is waiting
+        times = [self._due_at(s, st, visible) for s, st in self._states.items() if not st.in_flight]
+        if not times:
+            return None
+        return max(0.0, max(min(times), self.paused_until) - now)
+
+    def stats(self, now: Optional[float] = None) -> dict:
+        now = time.time() if now is None else now
+        return dict(
+            self.counters,
+            used_weight=self.current_weight(now),
+            weight_limit=self.weight_limit,
+            paused_for=round(max(0.0, self.paused_until - now), 1),
+            failing=sum(1 for st in self._states.values() if st.failures),
+            in_flight=sum(1 for st in self._states.values() if st.in_flight),
+            recent=list(self.decisions)[-10:],
+        )
+
+# ---------- Price Daemon ----------
+FEED_PROTOCOL = 1
+
+class _FeedClient:
+    # One writer thread per subscriber behind a bounded backlog: publish only queues,
+    # so a client that stops reading is dropped instead of stalling the poll thread,
+    # and the snapshot and live ticks never interleave on the socket.
+    MAX_BACKLOG_BYTES = 1 << 20
+    def __init__(self, conn):
+        self.conn = conn
+        self.wanted = set()
+        self.closed = False
+        self._pending = deque()
+        self._pending_bytes = 0
+        self._cond = threading.Condition()
+
+    def offer(self, data: bytes) -> bool:
+        # False when the client is gone or too far behind
+        with self._cond:
+            if self.closed or self._pending_bytes + len(data) > self.MAX_BACKLOG_BYTES:
+                return False
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+            self._cond.notify()
+            return True
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+    def run(self, on_error):
+        while True:
+            with self._cond:
+                while not self._pending and not self.closed:
+                    self._cond.wait()
+                if self.closed:
+                    return
+                data = b"".join(self._pending)
+                self._pending.clear()
+                self._pending_bytes = 0
+            try:
+                self.conn.sendall(data)
+            except OSError:
+                on_error()
                 return
-        except Exception:
+
+class TickHub:
+    # Loopback fan-out for the headless daemon. Newline-delimited JSON both ways:
+    # clients send {"op": "subscribe", "symbols": [...]} (or ["*"]), the hub answers
+    # with {"type": "hello"} and then {"type": "tick", "symbol", "price", "ts", "source"}
+    # lines; a null price means the last poll for that symbol failed.
+    def __init__(self, host: str = "127.0.0.1", port: int = 47711, on_subscribe=None):
+        self.sock = socket.create_server((host, port))
+        self.address = self.sock.getsockname()
+        self.on_subscribe = on_subscribe
+        self.last = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        threading.Thread(target=self._accept_loop, name="tick-hub", daemon=True).start()
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            client = _FeedClient(conn)
+            with self._lock:
+                self._clients[conn] = client
+            threading.Thread(target=client.run, args=(lambda c=client: self._drop(c),),
+                             name="tick-hub-writer", daemon=True).start()
+            threading.Thread(target=self._serve, args=(client,), name="tick-hub-reader", daemon=True).start()
+
+    def _serve(self, client):
+        try:
+            self._send(client, [{"type": "hello", "protocol": FEED_PROTOCOL}])
+            for line in client.conn.makefile("r", encoding="utf-8"):
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(msg, dict) or msg.get("op") != "subscribe":
+                    continue
+                wanted = {canonical_symbol(x) if x != "*" else "*" for x in msg.get("symbols", [])}
+                with self._lock:
+                    client.wanted = wanted
+                    snapshot = [t for sym, t in self.last.items() if "*" in wanted or sym in wanted]
+                # late subscribers get the latest known prices straight away
+                self._send(client, snapshot)
+                if self.on_subscribe is not None:
+                    self.on_subscribe()
+        except (OSError, ValueError):
             pass
-        pix = make_fallback_pixmap(symbol_upper, size=128)
-        self.icon_fetched.emit(self.symbol, pix)
+        finally:
+            self._drop(client)
+
+    def _send(self, client, ticks):
+        if ticks and not client.offer("".join(json.dumps(t, separators=(",", ":")) + "\n" for t in ticks).encode()):
+            if not client.closed:
+                metrics.inc("feed_clients_dropped_total", {"reason": "slow"})
+            self._drop(client)
+
+    def _drop(self, client):
+        with self._lock:
+            if self._clients.pop(client.conn, None) is None and client.closed:
+                return
+        client.close()
+        try:
+            # shutdown first: the reader thread's makefile keeps the fd alive past close(),
+            # and a writer stuck in sendall is released by it
+            client.conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        client.conn.close()
+
+    def symbols(self) -> set:
+        with self._lock:
+            return set().union(*(c.wanted for c in self._clients.values())) - {"*"} if self._clients else set()
+
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def publish(self, ticks):
+        with self._lock:
+            for t in ticks:
+                if t["price"] is not None:
+                    self.last[t["symbol"]] = t
+            clients = list(self._clients.values())
+        for client in clients:
+            self._send(client, [t for t in ticks if "*" in client.wanted or t["symbol"] in client.wanted])
+
+    def close(self):
+        self._closed = True
+        self.sock.close()
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            self._drop(client)
+
+class PriceDaemon:
+    # One polling loop for every widget on the machine: polls the union of its own
+    # symbols and everything subscribers ask for, and publishes ticks through a TickHub.
+    def __init__(self, symbols=(), host: str = "127.0.0.1", port: int = 47711, on_tick=None):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.hub = TickHub(host, port, on_subscribe=self._wake.set)
+        self.base_symbols = [canonical_symbol(x) for x in symbols]
+        self.on_tick = on_tick
+        self.poller = PollScheduler(
+            max(5, config.get("update_interval", 30)), 1, config.get("max_backoff", 300),
+            config.get("rate_limit_weight", 6000), config.get("rate_limit_budget", 0.5),
+        )
+
+    def symbols(self) -> list:
+        return list(dict.fromkeys(self.base_symbols + sorted(self.hub.symbols())))
+
+    def run(self):
+        self.hub.start()
+        try:
+            while not self._stop.is_set():
+                symbols = self.symbols()
+                self.poller.set_symbols(symbols)
+                # everything is "visible" here; a subscriber is by definition showing it
+                due = self.poller.due(time.time(), set(symbols))
+                if due:
+                    self._poll(due, set(symbols))
+                wait = self.poller.next_wakeup(time.time(), set(symbols))
+                self._wake.wait(60 if wait is None else max(0.25, wait))
+                self._wake.clear()
+        finally:
+            self.hub.close()
+
+    def _poll(self, symbols, visible):
+        meta = {}
+        try:
+            prices = fetch_prices(symbols, meta=meta)
+        except RateLimitError as e:
+            self.poller.note_weight(e.used_weight, time.time())
+            self.poller.pause(e.retry_after, time.time())
+            prices = e.prices
+        except Exception:
+            prices = {x: None for x in symbols}
+        now = time.time()
+        self.poller.note_weight(meta.get("used_weight"), now)
+        self.poller.record_success([x for x in symbols if prices.get(x) is not None], now, visible)
+        self.poller.record_failure([x for x in symbols if prices.get(x) is None], now, visible)
+        sources = meta.get("sources", {})
+        ticks = [{"type": "tick", "symbol": x, "price": prices.get(x), "ts": round(now, 3),
+                  "source": sources.get(x)} for x in symbols]
+        self.hub.publish(ticks)
+        metrics.set_gauge("daemon_clients", self.hub.client_count())
+        metrics.set_gauge("threads", threading.active_count())
+        if self.on_tick is not None:
+            for t in ticks:
+                self.on_tick(t)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+def read_feed(symbols, host: str = "127.0.0.1", port: int = 47711, timeout: float = 2):
+    # yields tick dicts from a running daemon; raises OSError when none is listening
+    conn = socket.create_connection((host, port), timeout=timeout)
+    with conn:
+        lines = conn.makefile("r", encoding="utf-8")
+        hello = json.loads(lines.readline() or "{}")
+        if hello.get("type") != "hello":
+            raise ConnectionError("not a crypto-widget price feed")
+        conn.settimeout(None)
+        conn.sendall((json.dumps({"op": "subscribe", "symbols": list(symbols) or ["*"]}) + "\n").encode())
+        for line in lines:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+# ---------- Fetch Scheduler ----------
+class FetchScheduler:
+    # All network I/O goes through one asyncio loop on a background thread. Jobs are
+    # keyed by (kind, item) so a symbol already in flight is not fetched twice, a
+    # semaphore caps concurrency, and blocking calls run on a matching executor.
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.loop = asyncio.new_event_loop()
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "deduplicated": 0}
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="fetch")
+        self._thread = threading.Thread(target=self._run, name="fetch-scheduler", daemon=True)
+        self._semaphore = None
+        # loop-thread only: task -> [state, kind, items] and (kind, item) -> task
+        self._tasks = {}
+        self._inflight = {}
+        # tasks per state, kept by the loop thread so stats() never walks _tasks
+        self._states = {"queued": 0, "running": 0}
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.loop.run_forever()
+
+    def submit(self, kind: str, items, fn, on_done):
+        # fn(items) runs on the executor; on_done(kind, items, result, error) runs on the loop thread
+        self.loop.call_soon_threadsafe(self._submit, kind, list(items), fn, on_done)
+
+    def cancel(self, kind: str, keep=()):
+        self.loop.call_soon_threadsafe(self._cancel, kind, set(keep))
+
+    def set_max_concurrency(self, max_concurrency: int):
+        self.loop.call_soon_threadsafe(self._set_max_concurrency, max(1, int(max_concurrency)))
+
+    def stats(self) -> dict:
+        return dict(self.counters, in_flight=self._states["running"], queued=self._states["queued"])
+
+    def shutdown(self):
+        if not self._thread.is_alive():
+            return
+        self.loop.call_soon_threadsafe(self._shutdown)
+        self._thread.join(timeout=2)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _shutdown(self):
+        for task in list(self._tasks):
+            task.cancel()
+        self.loop.stop()
+
+    def _set_max_concurrency(self, n):
+        if n == self.max_concurrency:
+            return
+        # jobs already holding or waiting on the old semaphore finish under the old limit
+        old = self._executor
+        self.max_concurrency = n
+        self._semaphore = asyncio.Semaphore(n)
+        self._executor = ThreadPoolExecutor(max_workers=n, thread_name_prefix="fetch")
+        old.shutdown(wait=False)
+
+    def _submit(self, kind, items, fn, on_done):
+        todo = [i for i in dict.fromkeys(items) if (kind, i) not in self._inflight]
+        self.counters["deduplicated"] += len(items) - len(todo)
+        if not todo:
+            return
+        self.counters["submitted"] += 1
+        task = self.loop.create_task(self._execute(kind, todo, fn, on_done))
+        self._tasks[task] = ["queued", kind, todo]
+        self._states["queued"] += 1
+        for item in todo:
+            self._inflight[(kind, item)] = task
+        task.add_done_callback(self._forget)
+
+    async def _execute(self, kind, items, fn, on_done):
+        async with self._semaphore:
+            self._tasks[asyncio.current_task()][0] = "running"
+            self._states["queued"] -= 1
+            self._states["running"] += 1
+            try:
+                result = await self.loop.run_in_executor(self._executor, fn, items)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters["failed"] += 1
+                on_done(kind, items, None, e)
+                return
+        self.counters["completed"] += 1
+        on_done(kind, items, result, None)
+
+    def _forget(self, task):
+        state, kind, items = self._tasks.pop(task)
+        self._states[state] -= 1
+        if task.cancelled():
+            self.counters["cancelled"] += 1
+        for item in items:
+            if self._inflight.get((kind, item)) is task:
+                del self._inflight[(kind, item)]
+
+    def _cancel(self, kind, keep):
+        for task, (_, task_kind, items) in list(self._tasks.items()):
+            # a batch that still serves a kept symbol is left to finish
+            if task_kind == kind and not keep.intersection(items):
+                task.cancel()
+
+class FetchBridge(QObject):
+    # scheduler callbacks fire on the loop thread; emitting queues them onto the GUI thread
+    finished = pyqtSignal(str, list, object, object)
+
+# ---------- Streaming Prices ----------
+class PriceStream(QObject):
+    # combined-stream subscription; lives on the GUI thread and is driven by Qt's event loop
+    prices_received = pyqtSignal(dict)
+    connected = pyqtSignal()
+    disconnected = pyqtSignal()
+    RECONNECT_MIN_MS = 1000
+    RECONNECT_MAX_MS = 60000
+    SILENCE_TIMEOUT_MS = 60000
+    def __init__(self, base_url: Optional[str] = None, kind: str = "miniTicker", parent=None):
+        super().__init__(parent)
+        self.base_url = base_url or BINANCE_STREAM_URL
+        self.kind = kind if kind in ("miniTicker", "bookTicker") else "miniTicker"
+        self.symbols = {}
+        self.is_connected = False
+        self._active = False
+        self._backoff_ms = self.RECONNECT_MIN_MS
+        self.socket = QWebSocket()
+        self.socket.setParent(self)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.disconnected.connect(self._on_disconnected)
+        self.socket.textMessageReceived.connect(self._on_message)
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self._open)
+        # the exchange can go quiet without closing the socket; treat silence as a drop
+        self.silence_timer = QTimer(self)
+        self.silence_timer.setSingleShot(True)
+        self.silence_timer.timeout.connect(self.socket.abort)
+
+    def start(self, symbols):
+        symbols = {s.upper(): s for s in symbols}
+        if self._active and symbols == self.symbols:
+            return
+        self.symbols = symbols
+        self._active = True
+        self._backoff_ms = self.RECONNECT_MIN_MS
+        self.reconnect_timer.stop()
+        if self.is_connected:
+            # resubscribe by reconnecting; _on_disconnected schedules the reopen
+            self.socket.close()
+        else:
+            self.socket.abort()
+            self._open()
+
+    def stop(self):
+        self._active = False
+        self.reconnect_timer.stop()
+        self.silence_timer.stop()
+        self.socket.close()
+
+    def stream_url(self) -> str:
+        streams = "/".join(f"{s.lower()}@{self.kind}" for s in self.symbols)
+        return f"{self.base_url.rstrip('/')}/stream?streams={streams}"
+
+    def _open(self):
+        if not self._active or not self.symbols:
+            return
+        self.silence_timer.start(self.SILENCE_TIMEOUT_MS)
+        self.socket.open(QUrl(self.stream_url()))
+
+    def _on_connected(self):
+        self.is_connected = True
+        self._backoff_ms = self.RECONNECT_MIN_MS
+        self.connected.emit()
+
+    def _on_disconnected(self):
+        was_connected, self.is_connected = self.is_connected, False
+        self.silence_timer.stop()
+        if was_connected:
+            self.disconnected.emit()
+        if self._active:
+            self.reconnect_timer.start(self._backoff_ms if not was_connected else self.RECONNECT_MIN_MS)
+            if not was_connected:
+                self._backoff_ms = min(self._backoff_ms * 2, self.RECONNECT_MAX_MS)
+
+    def _on_message(self, text: str):
+        self.silence_timer.start(self.SILENCE_TIMEOUT_MS)
+        try:
+            msg = json.loads(text)
+            data = msg.get("data", msg)
+            symbol = self.symbols.get(str(data.get("s", "")).upper())
+            if symbol is None:
+                return
+            if self.kind == "bookTicker":
+                price = (float(data["b"]) + float(data["a"])) / 2
+            else:
+                price = float(data["c"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return
+        self.prices_received.emit({symbol: price})
+
+class PriceFeed(QObject):
+    # subscriber side of the local daemon; same signals as PriceStream so the widget treats both alike
+    prices_received = pyqtSignal(dict)
+    connected = pyqtSignal()
+    disconnected = pyqtSignal()
+    RECONNECT_MIN_MS = 2000
+    RECONNECT_MAX_MS = 60000
+    def __init__(self, host: str = "127.0.0.1", port: int = 47711, parent=None):
+        super().__init__(parent)
+        self.host, self.port = host, port
+        self.symbols = []
+        self.is_connected = False
+        self._active = False
+        self._backoff_ms = self.RECONNECT_MIN_MS
+        self.socket = QTcpSocket(self)
+        self.socket.connected.connect(self._subscribe)
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.disconnected.connect(self._on_disconnected)
+        self.socket.errorOccurred.connect(lambda _err: self._on_disconnected())
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self._open)
+
+    def start(self, symbols):
+        symbols = list(symbols)
+        if self._active and symbols == self.symbols:
+            return
+        self.symbols = symbols
+        self._active = True
+        if self.socket.state() == QTcpSocket.SocketState.ConnectedState:
+            self._subscribe()
+        else:
+            self._open()
+
+    def stop(self):
+        self._active = False
+        self.reconnect_timer.stop()
+        self.socket.abort()
+        self._on_disconnected()
+
+    def _open(self):
+        if self._active and self.socket.state() == QTcpSocket.SocketState.UnconnectedState:
+            self.socket.connectToHost(self.host, self.port)
+
+    def _subscribe(self):
+        self.socket.write((json.dumps({"op": "subscribe", "symbols": self.symbols}) + "\n").encode())
+
+    def _on_ready_read(self):
+        prices = {}
+        while self.socket.canReadLine():
+            try:
+                msg = json.loads(bytes(self.socket.readLine()).decode())
+            except ValueError:
+                continue
+            if not isinstance(msg, dict):
+                continue
+            if msg.get("type") == "hello" and not self.is_connected:
+                # only count as connected once the peer proves it is our daemon
+                self.is_connected = True
+                self._backoff_ms = self.RECONNECT_MIN_MS
+                self.connected.emit()
+            elif msg.get("type") == "tick" and msg.get("symbol") in self.symbols:
+                price = msg.get("price")
+                try:
+                    prices[msg["symbol"]] = float(price) if price is not None else None
+                except (TypeError, ValueError):
+                    continue
+        if prices:
+            self.prices_received.emit(prices)
+
+    def _on_disconnected(self):
+        was_connected, self.is_connected = self.is_connected, False
+        if was_connected:
+            self.disconnected.emit()
+        if self._active and not self.reconnect_timer.isActive():
+            self.socket.abort()
+            self.reconnect_timer.start(self._backoff_ms)
+            self._backoff_ms = min(self._backoff_ms * 2, self.RECONNECT_MAX_MS)
+
+# ---------- Slide Animation ----------
+# name -> QEasingCurve.Type, or a callable mapping progress 0..1 to 0..1
+EASING_CURVES = {
+    "linear": QEasingCurve.Type.Linear,
+    "ease_in": QEasingCurve.Type.InCubic,
+    "ease_out": QEasingCurve.Type.OutCubic,
+    "ease_in_out": QEasingCurve.Type.InOutCubic,
+    "ease_out_quint": QEasingCurve.Type.OutQuint,
+    "ease_out_back": QEasingCurve.Type.OutBack,
+    "smoothstep": lambda t: t * t * (3 - 2 * t),
+}
+
+def make_easing_curve(name: str) -> QEasingCurve:
+    spec = EASING_CURVES.get(name, EASING_CURVES["ease_out"])
+    if isinstance(spec, QEasingCurve.Type):
+        return QEasingCurve(spec)
+    curve = QEasingCurve()
+    curve.setCustomType(spec)
+    return curve
+
+class AnimationStats:
+    REFRESH_HZ = 60
+    def __init__(self):
+        self.transitions = 0
+        self.frames = 0
+        self.dropped_frames = 0
+        self.last_fps = 0.0
+        self.last_frames = 0
+        self.last_duration_ms = 0.0
+        self._started = None
+        self._frames = 0
+    def begin(self):
+        self._started = time.perf_counter()
+        self._frames = 0
+    def frame(self):
+        self._frames += 1
+    def end(self):
+        if self._started is None:
+            return
+        elapsed = time.perf_counter() - self._started
+        self._started = None
+        expected = int(elapsed * self.REFRESH_HZ)
+        self.transitions += 1
+        self.frames += self._frames
+        self.dropped_frames += max(0, expected - self._frames)
+        self.last_frames = self._frames
+        self.last_duration_ms = elapsed * 1000
+        self.last_fps = self._frames / elapsed if elapsed > 0 else 0.0
+        metrics.observe("slide_frames", self._frames, buckets=FRAME_BUCKETS)
+    def snapshot(self) -> dict:
+        return {
+            "transitions": self.transitions, "frames": self.frames,
+            "dropped_frames": self.dropped_frames, "last_fps": round(self.last_fps, 1),
+            "last_frames": self.last_frames, "last_duration_ms": round(self.last_duration_ms, 1),
+        }
 
 # ---------- Settings Dialog ----------
 class SettingsDialog(QDialog):
@@ -156,24 +2419,43 @@ class SettingsDialog(QDialog):
         content_layout = QVBoxLayout(self.settingsContent)
         layout.addWidget(self.settingsContent)
 
-        grid = QGridLayout()
-        grid.setVerticalSpacing(10)
-        grid.setHorizontalSpacing(10)
-
-        self.symbol1_edit = QLineEdit()
-        self.decimals1_spin = QSpinBox(); self.decimals1_spin.setRange(0,8)
-        self.symbol2_edit = QLineEdit()
-        self.decimals2_spin = QSpinBox(); self.decimals2_spin.setRange(0,8)
-        self.symbol3_edit = QLineEdit()
-        self.decimals3_spin = QSpinBox(); self.decimals3_spin.setRange(0,8)
-
-        grid.addWidget(QLabel("Coin 1"),1,0); grid.addWidget(self.symbol1_edit,1,1)
-        grid.addWidget(self.decimals1_spin,1,2)
-        grid.addWidget(QLabel("Coin 2"),2,0); grid.addWidget(self.symbol2_edit,2,1)
-        grid.addWidget(self.decimals2_spin,2,2)
-        grid.addWidget(QLabel("Coin 3"),3,0); grid.addWidget(self.symbol3_edit,3,1)
-        grid.addWidget(self.decimals3_spin,3,2)
-        content_layout.addLayout(grid)
+        self.watchlist_table = QTableWidget(0, 2)
+        self.watchlist_table.setHorizontalHeaderLabels(["Symbol", "Decimals"])
+        self.watchlist_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.watchlist_table.verticalHeader().setVisible(False)
+        self.watchlist_table.setMinimumHeight(140)
+        content_layout.addWidget(self.watchlist_table)
+
+        list_row = QHBoxLayout()
+        add_btn = QPushButton("Add Coin"); add_btn.clicked.connect(lambda: self._add_watchlist_row("", 2, edit=True))
+        add_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        remove_btn = QPushButton("Remove"); remove_btn.clicked.connect(self._remove_watchlist_rows)
+        remove_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        list_row.addWidget(add_btn); list_row.addWidget(remove_btn); list_row.addStretch()
+        content_layout.addLayout(list_row)
+
+        self.alerts_table = QTableWidget(0, 5)
+        self.alerts_table.setHorizontalHeaderLabels(["Symbol", "Rule", "Price / %", "Window min", "Action"])
+        self.alerts_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.alerts_table.verticalHeader().setVisible(False)
+        self.alerts_table.setMinimumHeight(110)
+        content_layout.addWidget(self.alerts_table)
+
+        alert_row = QHBoxLayout()
+        add_alert_btn = QPushButton("Add Alert"); add_alert_btn.clicked.connect(self._on_add_alert)
+        add_alert_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        remove_alert_btn = QPushButton("Remove"); remove_alert_btn.clicked.connect(self._remove_alert_rows)
+        remove_alert_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        alert_row.addWidget(add_alert_btn); alert_row.addWidget(remove_alert_btn); alert_row.addStretch()
+        content_layout.addLayout(alert_row)
+
+        mode_row = QHBoxLayout()
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Rotating Slides", "slide")
+        self.mode_combo.addItem("Ticker Tape", "ticker")
+        self.mode_combo.addItem("Grid", "grid")
+        mode_row.addWidget(QLabel("Display Mode")); mode_row.addWidget(self.mode_combo, 1)
+        content_layout.addLayout(mode_row)
 
         # sliders
         self.text_size_label = QLabel(); self.text_size_slider = QSlider(Qt.Orientation.Horizontal)
@@ -188,6 +2470,10 @@ class SettingsDialog(QDialog):
         self.cycle_slider.setRange(1,60)
         self.cycle_slider.valueChanged.connect(lambda val: self.cycle_label.setText(f"Cycle Interval: {val}s"))
         
+        self.duration_label = QLabel(); self.duration_slider = QSlider(Qt.Orientation.Horizontal)
+        self.duration_slider.setRange(100, 2000); self.duration_slider.setSingleStep(50)
+        self.duration_slider.valueChanged.connect(lambda val: self.duration_label.setText(f"Slide Duration: {val}ms"))
+
         self.update_label = QLabel(); self.update_slider = QSlider(Qt.Orientation.Horizontal)
         self.update_slider.setRange(1, 300)
         self.update_slider.valueChanged.connect(lambda val: self.update_label.setText(f"Update Interval: {val}s"))
@@ -198,12 +2484,19 @@ class SettingsDialog(QDialog):
         content_layout.addWidget(self.bg_slider)
         content_layout.addWidget(self.cycle_label)
         content_layout.addWidget(self.cycle_slider)
+        content_layout.addWidget(self.duration_label)
+        content_layout.addWidget(self.duration_slider)
         content_layout.addWidget(self.update_label)
         content_layout.addWidget(self.update_slider)
 
         # checkboxes
         self.cycle_checkbox = QCheckBox("Enable Symbol Rotation")
         content_layout.addWidget(self.cycle_checkbox)
+        self.sparkline_checkbox = QCheckBox("Show Sparkline && 24h Change")
+        content_layout.addWidget(self.sparkline_checkbox)
+        self.stream_checkbox = QCheckBox("Live Streaming Prices (WebSocket)")
+        self.stream_checkbox.setEnabled(QWebSocket is not None)
+        content_layout.addWidget(self.stream_checkbox)
 
         # buttons
         btn_row = QHBoxLayout()
@@ -244,19 +2537,114 @@ class SettingsDialog(QDialog):
         self.setGraphicsEffect(shadow)
 
     def _load_config_values(self):
-        self.symbol1_edit.setText(config["symbol1"])
-        self.symbol2_edit.setText(config["symbol2"])
-        self.symbol3_edit.setText(config["symbol3"])
-        self.decimals1_spin.setValue(config["decimals1"])
-        self.decimals2_spin.setValue(config["decimals2"])
-        self.decimals3_spin.setValue(config["decimals3"])
+        for symbol, decimals in watchlist_entries():
+            self._add_watchlist_row(symbol, decimals)
+        for entry in config.get("alerts", []):
+            self._add_alert_row(AlertRule.from_dict(entry))
+        self.mode_combo.setCurrentIndex(max(0, self.mode_combo.findData(config.get("display_mode","slide"))))
         self.text_size_slider.setValue(config["text_size"])
         self.bg_slider.setValue(int(config["bg_opacity"]*100))
         self.cycle_slider.setValue(config["cycle_interval"])
+        self.duration_slider.setValue(int(config.get("slide_duration_ms",450)))
+        self.duration_label.setText(f"Slide Duration: {self.duration_slider.value()}ms")
         self.cycle_checkbox.setChecked(bool(config.get("cycle_enabled",True)))
+        self.stream_checkbox.setChecked(bool(config.get("stream_enabled",False)))
+        self.sparkline_checkbox.setChecked(bool(config.get("sparkline_enabled",True)))
         self.update_slider.setValue(config.get("update_interval",10))
         self.update_label.setText(f"Update Interval: {self.update_slider.value()}s")
 
+    # --- watchlist rows ---
+    def _add_watchlist_row(self, symbol, decimals, edit=False):
+        row = self.watchlist_table.rowCount()
+        self.watchlist_table.insertRow(row)
+        self.watchlist_table.setItem(row, 0, QTableWidgetItem(symbol))
+        spin = QSpinBox(); spin.setRange(0, Watchlist.MAX_DECIMALS); spin.setValue(decimals)
+        self.watchlist_table.setCellWidget(row, 1, spin)
+        if edit:
+            self.watchlist_table.setCurrentCell(row, 0)
+            self.watchlist_table.editItem(self.watchlist_table.item(row, 0))
+
+    def _remove_watchlist_rows(self):
+        rows = sorted({i.row() for i in self.watchlist_table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.watchlist_table.removeRow(row)
+
+    def _watchlist_entries(self) -> list:
+        entries = []
+        for row in range(self.watchlist_table.rowCount()):
+            item = self.watchlist_table.item(row, 0)
+            symbol = item.text().strip().upper() if item else ""
+            if symbol:
+                entries.append({"symbol": symbol, "decimals": int(self.watchlist_table.cellWidget(row, 1).value())})
+        return entries
+
+    # --- alert rows ---
+    def _on_add_alert(self):
+        # defaults to the first watchlist symbol, at its current price
+        parent = self.parent()
+        entries = self._watchlist_entries()
+        symbol = entries[0]["symbol"] if entries else "BTCUSDT"
+        record = parent.watchlist.get(symbol) if parent is not None and hasattr(parent, "watchlist") else None
+        price = record.price if record is not None and record.price else 1.0
+        self._add_alert_row(AlertRule(symbol, "cross_above", price), edit=True)
+
+    def _add_alert_row(self, rule, edit=False):
+        row = self.alerts_table.rowCount()
+        self.alerts_table.insertRow(row)
+        symbol_item = QTableWidgetItem(rule.symbol)
+        # keeps id, cooldown and once across an edit
+        symbol_item.setData(Qt.ItemDataRole.UserRole, rule.to_dict())
+        if not rule.enabled:
+            symbol_item.setForeground(QColor(150, 150, 150))
+            symbol_item.setToolTip("Already fired; change the rule to arm it again")
+        self.alerts_table.setItem(row, 0, symbol_item)
+        kind = QComboBox()
+        for name in ALERT_KINDS:
+            kind.addItem(name.replace("_", " "), name)
+        kind.setCurrentIndex(ALERT_KINDS.index(rule.kind))
+        self.alerts_table.setCellWidget(row, 1, kind)
+        self.alerts_table.setItem(row, 2, QTableWidgetItem(f"{rule.value:g}"))
+        window = QSpinBox(); window.setRange(1, 24 * 60); window.setValue(int(rule.window // 60))
+        self.alerts_table.setCellWidget(row, 3, window)
+        action = QComboBox()
+        for name in ALERT_ACTIONS:
+            action.addItem(name, name)
+        action.setCurrentIndex(ALERT_ACTIONS.index(rule.action))
+        self.alerts_table.setCellWidget(row, 4, action)
+        if edit:
+            self.alerts_table.setCurrentCell(row, 2)
+            self.alerts_table.editItem(self.alerts_table.item(row, 2))
+
+    def _remove_alert_rows(self):
+        rows = sorted({i.row() for i in self.alerts_table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.alerts_table.removeRow(row)
+
+    def _alert_entries(self) -> Optional[list]:
+        # None when a row does not parse; that row is selected and the problem shown
+        entries = []
+        for row in range(self.alerts_table.rowCount()):
+            item = self.alerts_table.item(row, 0)
+            value = self.alerts_table.item(row, 2)
+            entry = dict(item.data(Qt.ItemDataRole.UserRole) or {}) if item else {}
+            kind = self.alerts_table.cellWidget(row, 1).currentData()
+            entry.pop("price", None); entry.pop("pct", None)
+            entry.update(symbol=item.text() if item else "", kind=kind,
+                         window_minutes=self.alerts_table.cellWidget(row, 3).value(),
+                         action=self.alerts_table.cellWidget(row, 4).currentData())
+            try:
+                entry["pct" if kind == "move_pct" else "price"] = float(value.text()) if value else None
+                rule = AlertRule.from_dict(entry)
+            except (TypeError, ValueError) as e:
+                self.alerts_table.setCurrentCell(row, 0 if not entry["symbol"].strip() else 2)
+                QMessageBox.warning(self, "Invalid Alert", f"Alert row {row + 1}: {e}")
+                return None
+            # a fired one-shot rule is armed again once it is edited
+            if rule.to_dict() != item.data(Qt.ItemDataRole.UserRole):
+                rule.enabled = True
+            entries.append(rule.to_dict())
+        return entries
+
     # --- animations ---
     def _fade_in(self):
         self.setWindowOpacity(1.0)
@@ -266,34 +2654,40 @@ class SettingsDialog(QDialog):
 
     # --- buttons ---
     def _on_refresh_cache(self):
-        clear_icon_cache()
         parent = self.parent()
-        if parent and hasattr(parent, "reload_icons_async"):
-            parent.reload_icons_async()
-        QMessageBox.information(self, "Cache Cleared", "Icon cache cleared. Icons will be re-downloaded.")
+        if parent and hasattr(parent, "revalidate_icons_async"):
+            parent.revalidate_icons_async(force=True)
+        QMessageBox.information(self, "Refreshing Icons", "Icons are being revalidated. Only changed icons will be re-downloaded.")
 
     def _on_save(self):
-        config["symbol1"] = self.symbol1_edit.text().strip().upper() or DEFAULT_CONFIG["symbol1"]
-        config["symbol2"] = self.symbol2_edit.text().strip().upper() or DEFAULT_CONFIG["symbol2"]
-        config["symbol3"] = self.symbol3_edit.text().strip().upper() or DEFAULT_CONFIG["symbol3"]
-        config["decimals1"] = int(self.decimals1_spin.value())
-        config["decimals2"] = int(self.decimals2_spin.value())
-        config["decimals3"] = int(self.decimals3_spin.value())
-        config["text_size"] = int(self.text_size_slider.value())
-        config["bg_opacity"] = float(self.bg_slider.value())/100.0
-        config["cycle_interval"] = int(self.cycle_slider.value())
-        config["cycle_enabled"] = bool(self.cycle_checkbox.isChecked())
-        config["update_interval"] = int(self.update_slider.value())
-        save_settings()
+        alerts = self._alert_entries()
+        if alerts is None:
+            return
+        changed = settings_store.update({
+            "watchlist": self._watchlist_entries() or [dict(e) for e in DEFAULT_CONFIG["watchlist"]],
+            "display_mode": self.mode_combo.currentData(),
+            "text_size": int(self.text_size_slider.value()),
+            "bg_opacity": float(self.bg_slider.value())/100.0,
+            "cycle_interval": int(self.cycle_slider.value()),
+            "slide_duration_ms": int(self.duration_slider.value()),
+            "cycle_enabled": bool(self.cycle_checkbox.isChecked()),
+            "stream_enabled": bool(self.stream_checkbox.isChecked()),
+            "sparkline_enabled": bool(self.sparkline_checkbox.isChecked()),
+            "update_interval": int(self.update_slider.value()),
+            "alerts": alerts,
+        })
         parent = self.parent()
-        if parent and hasattr(parent, "apply_settings"):
-            parent.apply_settings()
+        if changed and parent and hasattr(parent, "apply_settings"):
+            parent.apply_settings(changed)
         self._fade_close()
 
 # ---------- Main Widget ----------
 class CryptoWidget(QWidget):
     PADDING = 10
-    SLIDE_SPEED = 12  # pixels per frame
+    TAPE_GAP = 30
+    TAPE_FRAME_MS = 16
+    SLIDE_CACHE_MAX = 96
+    PUSH_FLUSH_MS = 100
     def __init__(self):
         super().__init__()
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint |
@@ -304,109 +2698,943 @@ class CryptoWidget(QWidget):
 
         # Force above taskbar on Windows
         if sys.platform=="win32":
+            import ctypes
             hwnd = self.winId().__int__()
             ctypes.windll.user32.SetWindowPos(hwnd, -1, 0,0,0,0, 0x13)
 
         # Symbols & prices
-        self.symbols = [config["symbol1"], config["symbol2"], config["symbol3"]]
-        self.decimals = [config["decimals1"], config["decimals2"], config["decimals3"]]
+        self.watchlist = Watchlist(watchlist_entries())
 
         self.current_index = 0
         self.slide_offset = 0
         self.slide_in_progress = False
+        self._slide_cache = OrderedDict()
+        self._font_cache = None
+        self._layout_fm = None
+        self._tape_offsets = None
+        self._tape_length = 0
+        self._tape_scroll = 0.0
+        self._tape_last = 0.0
+        self._grid_page = 0
+        self._grid_cell = (0, 0)
 
-        # Preload slides data: icon + symbol + price
-        self.slides = {}
-        for s in self.symbols:
-            self.slides[s] = {
-                "icon": make_fallback_pixmap(s.replace("USDT",""),size=128),
-                "symbol": s.replace("USDT",""),
-                "price": None
-            }
+        # symbol -> PriceHistory, filled from _on_price_fetched
+        self.history = {}
+        # last known prices from the previous run, so the first frame is not "..."
+        self.tick_store = TickStore(
+            TICK_STORE_FILE,
+            retention_hours=float(config.get("tick_retention_hours", 72)),
+            max_bytes=int(config.get("tick_store_mb", 32) * 1024 * 1024),
+            min_interval=self._history_span() / max(2, int(config.get("history_points", 720))),
+        )
+        for symbol, (ts, price) in self.tick_store.last_prices(self.watchlist.symbols).items():
+            self.watchlist.get(symbol).price = price
+        icon_cache.max_bytes = int(config.get("icon_cache_mb", 16) * 1024 * 1024)
+        self._icon_failed = set()
+        self._icon_pending = set()
+
+        self.fetch_bridge = FetchBridge(self)
+        self.fetch_bridge.finished.connect(self._on_fetch_finished)
+        self.scheduler = FetchScheduler(max_concurrency=config.get("max_concurrent_fetches", 4))
+        self.scheduler.start()
+        QApplication.instance().aboutToQuit.connect(self.scheduler.shutdown)
+        QApplication.instance().aboutToQuit.connect(self._flush_ticks_final)
 
         # timers
+        # single-shot, re-armed for whenever the poll scheduler next has something due
+        self.poller = PollScheduler()
+        self._configure_poller()
         self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.update_prices)
-        self.update_timer.start(max(5,config.get("update_interval",30))*1000)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.timeout.connect(self._poll_due)
 
         self.cycle_timer = QTimer(self)
-        self.cycle_timer.timeout.connect(self.start_slide)
+        self.cycle_timer.timeout.connect(self._on_cycle)
         if config.get("cycle_enabled",True):
             self.cycle_timer.start(max(3,config.get("cycle_interval",3))*1000)
 
-        self.slide_timer = QTimer(self)
-        self.slide_timer.timeout.connect(self._slide_step)
+        self.tick_flush_timer = QTimer(self)
+        self.tick_flush_timer.timeout.connect(self._flush_ticks)
+
+        self.icon_refresh_timer = QTimer(self)
+        self.icon_refresh_timer.timeout.connect(self.revalidate_icons_async)
+
+        # only runs while the overlay or the metrics endpoint is on
+        self.metrics_server = None
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self._publish_metrics)
+
+        # external edits to the settings file are picked up and applied key by key
+        self.settings_watcher = QFileSystemWatcher(self)
+        self.settings_watcher.fileChanged.connect(self._on_settings_path_changed)
+        self.settings_watcher.directoryChanged.connect(self._on_settings_path_changed)
+        self.settings_reload_timer = QTimer(self)
+        self.settings_reload_timer.setSingleShot(True)
+        self.settings_reload_timer.setInterval(300)
+        self.settings_reload_timer.timeout.connect(self._reload_settings_from_disk)
+
+        # time-based: runs only during a transition, so an idle widget paints nothing
+        self.slide_anim = QVariantAnimation(self)
+        self.slide_anim.valueChanged.connect(self._slide_step)
+        self.slide_anim.finished.connect(self._slide_finished)
+        self.anim_stats = AnimationStats()
+
+        # ticker tape scrolls continuously, so it has its own frame timer
+        self.tape_timer = QTimer(self)
+        self.tape_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.tape_timer.timeout.connect(self._tape_step)
+
+        self.price_stream = None
+        self.price_feed = None
+        self._changed_batch = None
+        self._pushed = {}
+        self.push_flush_timer = QTimer(self)
+        self.push_flush_timer.setSingleShot(True)
+        self.push_flush_timer.setInterval(self.PUSH_FLUSH_MS)
+        self.push_flush_timer.timeout.connect(self._flush_pushed)
+
+        # alerts are checked on every price; a fired one flashes its item and/or notifies
+        self.alerts = AlertEngine(self._alert_rules())
+        self._flashes = {}
+        self._tray = None
+        self.flash_timer = QTimer(self)
+        self.flash_timer.setInterval(50)
+        self.flash_timer.timeout.connect(self._flash_step)
 
         self.setMinimumSize(200,80)
         self.setSizePolicy(QSizePolicy.Policy.MinimumExpanding,QSizePolicy.Policy.Fixed)
 
-        # Load icons and initial prices
+        # first frame comes from cached state only: last prices from the tick store and
+        # whatever icons are on disk for the first screen; the network starts after it
+        self._started = False
+        self._preload_icons(self._visible_symbols())
+        self._apply_display_mode()
+        self.show()
+        startup.mark("window_shown")
+        # in case no paint arrives (e.g. started minimised), start anyway
+        QTimer.singleShot(1000, self._start_background)
+
+    def _preload_icons(self, symbols):
+        # a few small PNGs read synchronously beat a frame of placeholder circles
+        for symbol in symbols:
+            record = self.watchlist.get(symbol)
+            data = _read_cached_icon(symbol)
+            pix = QPixmap()
+            if record is not None and data is not None and pix.loadFromData(data):
+                icon_cache.put(record.icon_key, pix)
+
+    def _start_background(self):
+        if self._started:
+            return
+        self._started = True
+        startup.mark("network_start")
+        self.tick_flush_timer.start(30*1000)
+        self.icon_refresh_timer.start(3600*1000)
+        # older history is replayed off the GUI thread and merged in when ready
+        self._replay_history(self.watchlist.symbols)
+        self._setup_stream()
+        self._setup_feed()
         self.reload_icons_async()
         self.update_prices()
-        self.show()
+        self._setup_metrics()
+        self._watch_settings()
+        threading.Thread(target=_numpy, name="numpy-import", daemon=True).start()
 
     # --- price & icons ---
-    def update_prices(self):
-        for s in self.symbols:
-            worker = PriceWorker(s,parent=self)
-            worker.price_fetched.connect(self._on_price_fetched)
-            worker.finished.connect(worker.deleteLater)
-            worker.start()
+    def update_prices(self, symbols=None):
+        symbols = self.watchlist.symbols if symbols is None else list(symbols)
+        self.poller.mark_in_flight(symbols)
+        self.scheduler.submit("price", symbols, fetch_prices_with_meta, self.fetch_bridge.finished.emit)
+
+    def _configure_poller(self):
+        self.poller.configure(
+            max(5, config.get("update_interval",30)), config.get("offscreen_interval_factor", 6),
+            config.get("max_backoff", 300), config.get("rate_limit_weight", 6000),
+            config.get("rate_limit_budget", 0.5),
+        )
+        self.poller.set_symbols(self.watchlist.symbols)
+
+    def _visible_symbols(self) -> set:
+        if not len(self.watchlist):
+            return set()
+        mode = self._display_mode()
+        if mode == "grid":
+            return {r.symbol for r in self._grid_records()}
+        if mode == "ticker":
+            return {self.watchlist.at(i).symbol for i, _ in self._tape_visible()}
+        return {self.watchlist.at(self.current_index).symbol}
+
+    def _poll_due(self):
+        due = self.poller.due(time.time(), self._visible_symbols())
+        if due:
+            self.scheduler.submit("price", due, fetch_prices_with_meta, self.fetch_bridge.finished.emit)
+        self._schedule_poll()
+
+    def _schedule_poll(self):
+        if not self._started:
+            return
+        if self._push_connected():
+            self.update_timer.stop()
+            return
+        wait = self.poller.next_wakeup(time.time(), self._visible_symbols())
+        if wait is None:
+            self.update_timer.stop()
+        else:
+            self.update_timer.start(max(250, int(wait * 1000)))
+
+    def _on_prices_result(self, items, result, error):
+        now = time.time()
+        visible = self._visible_symbols()
+        if error is not None:
+            metrics.inc("price_updates_total",
+                        {"result": "rate_limited" if isinstance(error, RateLimitError) else "error"})
+            prices = {}
+            if isinstance(error, RateLimitError):
+                self.poller.note_weight(error.used_weight, now)
+                self.poller.pause(error.retry_after, now)
+                prices = error.prices
+            self.poller.record_success([s for s in items if prices.get(s) is not None], now, visible)
+            self.poller.record_failure([s for s in items if prices.get(s) is None], now, visible)
+            self._on_prices_fetched({s: prices.get(s) for s in items})
+        else:
+            prices, meta = result
+            metrics.inc("price_updates_total", {"result": "ok"})
+            priced = sum(1 for s in items if prices.get(s) is not None)
+            metrics.inc("price_symbols_total", {"result": "priced"}, priced)
+            metrics.inc("price_symbols_total", {"result": "missing"}, len(items) - priced)
+            self.poller.note_weight(meta.get("used_weight"), now)
+            self.poller.record_success([s for s in items if prices.get(s) is not None], now, visible)
+            self.poller.record_failure([s for s in items if prices.get(s) is None], now, visible)
+            self._on_prices_fetched(prices)
+        self._schedule_poll()
+
+    def _on_fetch_finished(self, kind, items, result, error):
+        if kind == "price":
+            self._on_prices_result(items, result, error)
+        elif kind == "icon":
+            for s in items:
+                img = result.get(s) if result else None
+                if img is not None and not img.isNull():
+                    self._on_icon_fetched(s, QPixmap.fromImage(img))
+                else:
+                    self._on_icon_fetched(s, None)
+            # disk hits may be past their TTL; revalidation skips the fresh ones without a request
+            self.revalidate_icons_async(items)
+        elif kind == "replay" and error is None:
+            self._merge_history(result)
+        elif kind == "icon_refresh" and error is None:
+            for s, img in result.items():
+                if not img.isNull():
+                    self._on_icon_fetched(s, QPixmap.fromImage(img))
+
+    def _on_prices_fetched(self, prices):
+        # the whole batch shares one layout pass and one repaint
+        self._changed_batch = set()
+        try:
+            for symbol, price in prices.items():
+                self._on_price_fetched(symbol, price)
+        finally:
+            changed, self._changed_batch = self._changed_batch, None
+        if changed:
+            self._refresh_records(changed)
+
+    def _on_pushed_prices(self, prices):
+        # stream and feed messages can arrive many times a second per symbol; keep the
+        # newest price of each and apply them together a few times a second
+        self._pushed.update(prices)
+        if not self.push_flush_timer.isActive():
+            self.push_flush_timer.start()
+
+    def _flush_pushed(self):
+        prices, self._pushed = self._pushed, {}
+        if prices:
+            self._on_prices_fetched(prices)
 
     def _on_price_fetched(self, symbol, price):
-        if symbol in self.slides:
-            self.slides[symbol]["price"] = price
-            if symbol == self.symbols[self.current_index]:
+        record = self.watchlist.get(symbol)
+        if record is not None:
+            if price is None:
+                # keep showing the last good price, marked stale, rather than dropping to "..."
+                if not record.stale:
+                    record.stale = True
+                    self._on_record_changed(symbol)
+                return
+            if record.price is not None:
+                record.prev_price = record.price
+            record.price = price
+            record.stale = False
+            startup.mark("first_price")
+            now = time.time()
+            history = self._history_for(symbol)
+            history.append(now, price)
+            self.tick_store.append(symbol, now, price)
+            self._on_record_changed(symbol)
+            if self.alerts.rules:
+                fired = self.alerts.evaluate(symbol, price, now, history)
+                if fired:
+                    self._on_alerts(fired)
+
+    def _history_span(self) -> float:
+        return float(config.get("history_hours", 24)) * 3600
+
+    def _history_for(self, symbol) -> PriceHistory:
+        hist = self.history.get(symbol)
+        if hist is None:
+            hist = PriceHistory(config.get("history_points", 720), self._history_span())
+            self.history[symbol] = hist
+        return hist
+
+    def _apply_history(self):
+        # rebuild the rings for the new span/size, then let the store fill in anything older
+        span = self._history_span()
+        points = int(config.get("history_points", 720))
+        for symbol, old in list(self.history.items()):
+            hist = PriceHistory(points, span)
+            for ts, price in zip(*old.series()):
+                hist.append(float(ts), float(price))
+            self.history[symbol] = hist
+        self.tick_store.min_interval = span / max(2, points)
+        self._slide_cache.clear()
+        self._replay_history(self.watchlist.symbols)
+        self.update()
+
+    # --- tick store ---
+    def _replay_history(self, symbols):
+        span = self._history_span()
+        self.scheduler.submit("replay", symbols, lambda items: self.tick_store.replay(items, span),
+                              self.fetch_bridge.finished.emit)
+
+    def _merge_history(self, replayed):
+        # replayed samples go in front of whatever arrived live while the replay ran
+        for symbol, samples in replayed.items():
+            if not samples or symbol not in self.watchlist:
+                continue
+            live_ts, live_px = self.history[symbol].series() if symbol in self.history else ((), ())
+            cutoff = float(live_ts[0]) if len(live_ts) else float("inf")
+            merged = PriceHistory(config.get("history_points", 720), self._history_span())
+            for ts, price in samples:
+                if ts < cutoff:
+                    merged.append(ts, price)
+            for ts, price in zip(live_ts, live_px):
+                merged.append(float(ts), float(price))
+            self.history[symbol] = merged
+            self._on_record_changed(symbol)
+
+    def _flush_ticks(self):
+        self.scheduler.submit("ticks", ["flush"], lambda _: self.tick_store.flush(), self.fetch_bridge.finished.emit)
+
+    def _flush_ticks_final(self):
+        try:
+            self.tick_store.flush(final=True)
+        except OSError:
+            pass
+
+    def _is_current(self, symbol) -> bool:
+        return len(self.watchlist) > 0 and self.watchlist.at(self.current_index).symbol == symbol
+
+    def _on_record_changed(self, symbol):
+        if self._changed_batch is not None:
+            self._changed_batch.add(symbol)
+        else:
+            self._refresh_records((symbol,))
+
+    def _refresh_records(self, symbols):
+        mode = self._display_mode()
+        if mode == "ticker":
+            # the tape repaints on its next frame; only these items' widths need refreshing
+            for symbol in symbols:
+                self._update_tape_item(symbol)
+        elif mode == "grid":
+            if any(r.symbol in symbols for r in self._grid_records()):
                 self._resize_to_content()
                 self.update()
+        elif len(self.watchlist) and self.watchlist.at(self.current_index).symbol in symbols:
+            self._resize_to_content()
+            self.update()
+
+    # --- streaming ---
+    def _setup_stream(self):
+        wanted = bool(config.get("stream_enabled", False)) and QWebSocket is not None
+        if not wanted:
+            if self.price_stream is not None:
+                self.price_stream.stop()
+                self.price_stream.deleteLater()
+                self.price_stream = None
+            if not self.update_timer.isActive():
+                self._schedule_poll()
+            return
+        kind = config.get("stream_kind", "miniTicker")
+        if self.price_stream is None or self.price_stream.kind != kind:
+            if self.price_stream is not None:
+                self.price_stream.stop()
+                self.price_stream.deleteLater()
+            self.price_stream = PriceStream(kind=kind, parent=self)
+            self.price_stream.prices_received.connect(self._on_pushed_prices)
+            self.price_stream.connected.connect(self._on_stream_connected)
+            self.price_stream.disconnected.connect(self._on_stream_dropped)
+            QApplication.instance().aboutToQuit.connect(self.price_stream.stop)
+        self.price_stream.start(self.watchlist.symbols)
+        if self.price_stream.is_connected:
+            self.update_timer.stop()
+
+    def _setup_feed(self):
+        wanted = bool(config.get("feed_enabled", True)) and QTcpSocket is not None
+        port = int(config.get("feed_port", 47711))
+        if self.price_feed is not None and (not wanted or self.price_feed.port != port):
+            self.price_feed.stop()
+            self.price_feed.deleteLater()
+            self.price_feed = None
+        if not wanted:
+            self._schedule_poll()
+            return
+        if self.price_feed is None:
+            self.price_feed = PriceFeed(port=port, parent=self)
+            self.price_feed.prices_received.connect(self._on_pushed_prices)
+            self.price_feed.connected.connect(self._on_stream_connected)
+            self.price_feed.disconnected.connect(self._on_stream_dropped)
+            QApplication.instance().aboutToQuit.connect(self.price_feed.stop)
+        self.price_feed.start(self.watchlist.symbols)
+
+    def _push_connected(self) -> bool:
+        # a WebSocket stream or the local daemon feed makes REST polling redundant
+        return any(src is not None and src.is_connected for src in (self.price_stream, self.price_feed))
 
-    def reload_icons_async(self):
-        for s in self.symbols:
-            w = IconWorker(s,parent=self)
-            w.icon_fetched.connect(self._on_icon_fetched)
-            w.finished.connect(w.deleteLater)
-            w.start()
+    def _on_stream_connected(self):
+        # the stream now drives the prices; REST polling only resumes if it drops
+        self.update_timer.stop()
+
+    def _on_stream_dropped(self):
+        if self._push_connected():
+            return
+        self.update_prices()
+        self._schedule_poll()
+
+    def reload_icons_async(self, symbols=None):
+        if not self._started:
+            return  # _start_background loads every icon once the first frame is up
+        for s in (self.watchlist.symbols if symbols is None else symbols):
+            record = self.watchlist.get(s)
+            # icons already in memory need no trip through the scheduler
+            if record is not None and record.icon_key not in icon_cache and s not in self._icon_pending:
+                self._icon_pending.add(s)
+                self.scheduler.submit("icon", [s], load_icon_images, self.fetch_bridge.finished.emit)
+
+    def revalidate_icons_async(self, symbols=None, force=False):
+        symbols = self.watchlist.symbols if symbols is None else symbols
+        fn = functools.partial(revalidate_icons, force=True) if force else revalidate_icons
+        self.scheduler.submit("icon_refresh", symbols, fn, self.fetch_bridge.finished.emit)
 
     def _on_icon_fetched(self, symbol, pixmap):
-        if symbol in self.slides:
-            self.slides[symbol]["icon"] = pixmap
-            if symbol == self.symbols[self.current_index]:
-                self._resize_to_content()
-                self.update()
+        self._icon_pending.discard(symbol)
+        record = self.watchlist.get(symbol)
+        if record is not None:
+            if pixmap is None:
+                # remembered so an evicted placeholder is redrawn locally, not re-downloaded
+                self._icon_failed.add(record.icon_key)
+                pixmap = make_fallback_pixmap(record.icon_key, size=128)
+            else:
+                self._icon_failed.discard(record.icon_key)
+            icon_cache.put(record.icon_key, pixmap)
+            icon_cache.discard(("placeholder", record.icon_key))
+            self._on_record_changed(symbol)
+
+    def _icon_pixmap(self, record, size) -> QPixmap:
+        dpr = self.devicePixelRatioF()
+        pix = icon_cache.scaled(record.icon_key, size, dpr)
+        if pix is not None:
+            return pix
+        if record.icon_key in self._icon_failed:
+            icon_cache.put(record.icon_key, make_fallback_pixmap(record.icon_key, size=128))
+            return icon_cache.scaled(record.icon_key, size, dpr)
+        # evicted or not loaded yet: paint a placeholder while the disk tier reloads it
+        self.reload_icons_async([record.symbol])
+        placeholder = ("placeholder", record.icon_key)
+        if placeholder not in icon_cache:
+            icon_cache.put(placeholder, make_fallback_pixmap(record.icon_key, size=128))
+        return icon_cache.scaled(placeholder, size, dpr)
+
+    # --- metrics ---
+    def _setup_metrics(self):
+        want_server = bool(config.get("metrics_server", False))
+        port = int(config.get("metrics_port", 47712))
+        if self.metrics_server is not None and (not want_server or (port and self.metrics_server.address[1] != port)):
+            self.metrics_server.close()
+            self.metrics_server = None
+        if want_server and self.metrics_server is None:
+            try:
+                self.metrics_server = MetricsServer(metrics, port=port).start()
+            except OSError:
+                pass  # port already taken, e.g. by another widget or the daemon
+        if want_server or config.get("metrics_overlay", False):
+            if not self.metrics_timer.isActive():
+                self._publish_metrics()
+                self.metrics_timer.start(1000)
+        else:
+            self.metrics_timer.stop()
+        self.update()
+
+    def _publish_metrics(self):
+        # widget-side state is copied into gauges here, on the GUI thread
+        gauge = metrics.set_gauge
+        gauge("threads", threading.active_count())
+        gauge("watchlist_symbols", len(self.watchlist))
+        for key, value in self.alerts.stats().items():
+            gauge("alerts", value, {"stat": key})
+        gauge("push_feed_connected", 1 if self._push_connected() else 0)
+        for key, value in self.scheduler.stats().items():
+            gauge("scheduler_jobs", value, {"stat": key})
+        poll = self.poller.stats()
+        for key in ("used_weight", "paused_for", "failing", "in_flight"):
+            gauge(f"poller_{key}", poll[key])
+        icons = icon_cache.stats()
+        for key in ("hits", "misses", "evictions", "entries", "bytes"):
+            gauge("icon_cache", icons[key], {"stat": key})
+        lookups = icons["hits"] + icons["misses"]
+        gauge("icon_cache_hit_ratio", icons["hits"] / lookups if lookups else 0)
+        hits = metrics.counter_total("slide_cache_total", result="hit")
+        total = hits + metrics.counter_total("slide_cache_total", result="miss")
+        gauge("slide_cache_hit_ratio", hits / total if total else 0)
+        for key, value in self.anim_stats.snapshot().items():
+            gauge("animation", value, {"stat": key})
+        for name, ms in startup.snapshot().items():
+            gauge("startup_ms", ms, {"milestone": name})
+        if _transport is not None:
+            for host, c in _transport.connection_stats().items():
+                gauge("http_connections_opened", c["opened"], {"host": host})
+                gauge("http_connections_reused", c["reused"], {"host": host})
+        if config.get("metrics_overlay", False):
+            self.update()
+
+    def _paint_overlay(self, painter):
+        fetch = metrics.merged_histogram("http_request_ms")
+        paint = metrics.merged_histogram("paint_ms")
+        ok = metrics.counter_total("price_updates_total", result="ok")
+        failed = metrics.counter_total("price_updates_total") - ok
+        jobs = self.scheduler.stats()
+        anim = self.anim_stats.snapshot()
+        icons = icon_cache.stats()
+        lookups = icons["hits"] + icons["misses"]
+        hits = metrics.counter_total("slide_cache_total", result="hit")
+        slides = hits + metrics.counter_total("slide_cache_total", result="miss")
+        # three short lines so it fits the single-row slide height
+        fetch_text = f"p50<={fetch.quantile(0.5):g} p95<={fetch.quantile(0.95):g}ms" if fetch else "-"
+        paint_text = f"{paint.total / paint.count:.2f}ms" if paint else "-"
+        lines = [
+            f"fetch {fetch_text} ok {ok:g} fail {failed:g}",
+            f"threads {threading.active_count()} jobs {jobs['in_flight']}+{jobs['queued']} paint {paint_text}",
+            f"anim {anim['last_fps']:g}fps {anim['last_frames']}fr cache icon "
+            f"{icons['hits'] / lookups if lookups else 0:.0%} slide {hits / slides if slides else 0:.0%}",
+        ]
+        font = QFont("Consolas", 7)
+        fm = QFontMetrics(font)
+        box = QRect(2, 2, max(fm.horizontalAdvance(t) for t in lines) + 8, fm.height() * len(lines) + 4)
+        painter.setClipping(False)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 210))
+        painter.drawRect(box)
+        painter.setFont(font)
+        painter.setPen(QColor(120, 255, 160))
+        for i, text in enumerate(lines):
+            painter.drawText(box.left() + 4, box.top() + 2 + fm.ascent() + i * fm.height(), text)
+
+    # --- alerts ---
+    FLASH_SECONDS = 4.0
+    FLASH_PERIOD = 0.8
+
+    def _alert_rules(self) -> list:
+        return [AlertRule.from_dict(d) for d in config.get("alerts", [])]
+
+    def _on_alerts(self, fired):
+        for rule, message in fired:
+            metrics.inc("alerts_fired_total", {"kind": rule.kind, "action": rule.action})
+            # no tray (or notifications unsupported): the flash is the notification
+            notified = rule.action != "flash" and self._notify(rule.symbol, message)
+            if rule.action != "notify" or not notified:
+                self._flash(rule.symbol, rule.rising)
+        if any(rule.once for rule, _ in fired):
+            settings_store.update({"alerts": [r.to_dict() for r in self.alerts.rules.values()]})
+
+    def _notify(self, symbol, message) -> bool:
+        if not QSystemTrayIcon.isSystemTrayAvailable() or not QSystemTrayIcon.supportsMessages():
+            return False
+        record = self.watchlist.get(symbol)
+        icon = QIcon(self._icon_pixmap(record, 64)) if record is not None else QIcon(make_fallback_pixmap(symbol, 64))
+        if self._tray is None:
+            self._tray = QSystemTrayIcon(icon, self)
+            self._tray.setToolTip("Crypto Widget")
+            self._tray.show()
+        self._tray.showMessage("Price alert", message, icon, 10000)
+        return True
+
+    def _flash(self, symbol, rising):
+        position = self.watchlist.position(symbol)
+        if position < 0:
+            return
+        self._flashes[symbol] = (time.monotonic() + self.FLASH_SECONDS,
+                                 QColor(60, 220, 120) if rising else QColor(255, 80, 80))
+        # bring the symbol on screen and keep it there for a full cycle
+        mode = self._display_mode()
+        if mode == "slide" and not self.slide_in_progress and not self._is_current(symbol):
+            self.current_index = position
+            self._resize_to_content()
+        elif mode == "grid" and position // self._grid_page_size() != self._grid_page:
+            self._grid_page = position // self._grid_page_size()
+            self._resize_to_content()
+        if mode != "ticker" and self.cycle_timer.isActive():
+            self.cycle_timer.start()
+        if not self.flash_timer.isActive():
+            self.flash_timer.start()
+        self.update()
+
+    def _flash_step(self):
+        now = time.monotonic()
+        for symbol in [s for s, (until, _) in self._flashes.items() if until <= now]:
+            del self._flashes[symbol]
+        if not self._flashes:
+            self.flash_timer.stop()
+        if self._display_mode() != "ticker":
+            self.update()
+
+    def _flash_rects(self, mode):
+        # (rect, color) for every item on screen with a live flash
+        if mode == "ticker":
+            offsets, length = self._tape_layout()
+            for i, x in self._tape_visible():
+                flash = self._flashes.get(self.watchlist.at(i).symbol)
+                if flash is not None:
+                    end = offsets[i + 1] if i + 1 < len(offsets) else length
+                    yield QRect(int(x), 1, int(end - offsets[i] - self.TAPE_GAP), self.height() - 2), flash[1]
+        elif mode == "grid":
+            cell_w, cell_h = self._grid_cell
+            columns = max(1, int(config.get("grid_columns", 3)))
+            for n, record in enumerate(self._grid_records()):
+                flash = self._flashes.get(record.symbol)
+                if flash is not None:
+                    row, col = divmod(n, columns)
+                    yield QRect(self.PADDING + col * cell_w, self.PADDING // 2 + row * cell_h, cell_w, cell_h), flash[1]
+        elif len(self.watchlist):
+            flash = self._flashes.get(self.watchlist.at(self.current_index).symbol)
+            if flash is not None:
+                yield self.rect().adjusted(1, 1, -1, -1).translated(int(self.slide_offset), 0), flash[1]
+
+    def _paint_flashes(self, painter, mode):
+        pulse = 0.5 + 0.5 * math.cos(time.monotonic() * 2 * math.pi / self.FLASH_PERIOD)
+        painter.setPen(Qt.PenStyle.NoPen)
+        for rect, color in self._flash_rects(mode):
+            color = QColor(color)
+            color.setAlpha(int(40 + 90 * pulse))
+            painter.setBrush(color)
+            painter.drawRoundedRect(rect, 4, 4)
 
     # --- slide animation ---
+    def _on_cycle(self):
+        mode = self._display_mode()
+        if mode == "grid":
+            self._next_grid_page()
+        elif mode == "slide":
+            self.start_slide()
+
     def start_slide(self):
-        if not config.get("cycle_enabled", True) or self.slide_in_progress:
+        if not config.get("cycle_enabled", True) or self.slide_in_progress or len(self.watchlist) < 2:
             return
         self.prev_index = self.current_index
-        self.current_index = (self.current_index + 1) % len(self.symbols)
+        self.current_index = (self.current_index + 1) % len(self.watchlist)
         self.slide_offset = self.width()
         self.slide_in_progress = True
-        self.slide_timer.start(30)
-
-    def _slide_step(self):
-        self.slide_offset -= self.SLIDE_SPEED
-        if self.slide_offset <= 0:
-            self.slide_offset = 0
-            self.slide_in_progress = False
-            self.slide_timer.stop()
+        self.slide_anim.setStartValue(float(self.width()))
+        self.slide_anim.setEndValue(0.0)
+        self.slide_anim.setDuration(max(50, int(config.get("slide_duration_ms", 450))))
+        self.slide_anim.setEasingCurve(make_easing_curve(config.get("slide_easing", "ease_out")))
+        self.anim_stats.begin()
+        self.slide_anim.start()
+
+    def _slide_step(self, value):
+        if not self.slide_in_progress:
+            return
+        old_offset, self.slide_offset = self.slide_offset, float(value)
+        self.anim_stats.frame()
+        self.update(self._slide_dirty_region(old_offset, self.slide_offset))
+
+    def _slide_finished(self):
+        old_offset = self.slide_offset
+        self.slide_offset = 0
+        self.slide_in_progress = False
+        self.anim_stats.end()
+        self.update(self._slide_dirty_region(old_offset, 0))
+
+    def _slide_dirty_region(self, old_offset, new_offset):
+        # both slides' old and new footprints, clipped inside the static border
+        region = QRegion()
+        w, h = self.width(), self.height()
+        for index, shift in ((self.prev_index, -w), (self.current_index, 0)):
+            pix = self._slide_cache.get((self.watchlist.at(index).symbol, 200 if shift else 255))
+            pw = math.ceil(pix[1].deviceIndependentSize().width()) if pix is not None else w
+            left = int(self.PADDING + min(old_offset, new_offset) + shift)
+            right = int(self.PADDING + max(old_offset, new_offset) + shift) + pw + 1
+            region = region.united(QRegion(QRect(left, 0, right - left, h)))
+        return region.intersected(QRegion(self.rect().adjusted(1, 1, -1, -1)))
+
+    # --- ticker tape & grid ---
+    def _display_mode(self) -> str:
+        mode = config.get("display_mode", "slide")
+        return mode if mode in DISPLAY_MODES else "slide"
+
+    def _apply_display_mode(self):
+        self.slide_anim.stop()
+        self.slide_offset = 0
+        self.slide_in_progress = False
+        self._tape_offsets = None
+        self._grid_page = 0
+        self._slide_cache.clear()
+        if self._display_mode() == "ticker":
+            self._tape_last = time.perf_counter()
+            self.tape_timer.start(self.TAPE_FRAME_MS)
+        else:
+            self.tape_timer.stop()
+        self._resize_to_content()
+        self.update()
+
+    def _item_width(self, record, fm) -> int:
+        icon_size = int(config.get("text_size",24)*1.7)
+        return icon_size + self.PADDING*2 + fm.horizontalAdvance(record.base) + \
+            fm.horizontalAdvance(self._price_text(record)) + self._trend_width()
+
+    def _tape_layout(self):
+        # prefix offsets let painting bisect straight to the first visible item
+        if self._tape_offsets is None:
+            _, fm = self._slide_font()
+            offsets, x = array("d"), 0
+            for record in self.watchlist:
+                offsets.append(x)
+                x += self._item_width(record, fm) + self.TAPE_GAP
+            self._tape_offsets, self._tape_length = offsets, x
+        return self._tape_offsets, self._tape_length
+
+    def _update_tape_item(self, symbol):
+        # re-measure one item and shift the offsets after it, rather than the whole tape
+        offsets = self._tape_offsets
+        i = self.watchlist.position(symbol)
+        if offsets is None or i < 0:
+            return
+        _, fm = self._slide_font()
+        end = offsets[i + 1] if i + 1 < len(offsets) else self._tape_length
+        delta = self._item_width(self.watchlist.at(i), fm) + self.TAPE_GAP - (end - offsets[i])
+        if not delta:
+            return
+        for j in range(i + 1, len(offsets)):
+            offsets[j] += delta
+        self._tape_length += delta
+        # items already scrolled past keep their place on screen
+        if offsets[i] < self._tape_scroll:
+            self._tape_scroll += delta
+
+    def _tape_widths(self):
+        # symbol -> (decimals, measured width incl. gap), and the item under the scroll position
+        offsets = self._tape_offsets
+        if offsets is None or not len(offsets):
+            return None, None
+        ends = list(offsets[1:]) + [self._tape_length]
+        widths = {r.symbol: (r.decimals, end - start) for r, start, end in zip(self.watchlist, offsets, ends)}
+        i = max(0, bisect_right(offsets, self._tape_scroll) - 1)
+        return widths, (self.watchlist.at(i).symbol, self._tape_scroll - offsets[i])
+
+    def _patch_tape(self, widths, anchor):
+        # after a watchlist edit only new (or re-formatted) items are measured
+        _, fm = self._slide_font()
+        offsets, x = array("d"), 0
+        for record in self.watchlist:
+            offsets.append(x)
+            known = widths.get(record.symbol)
+            x += known[1] if known and known[0] == record.decimals else self._item_width(record, fm) + self.TAPE_GAP
+        self._tape_offsets, self._tape_length = offsets, x
+        symbol, into = anchor
+        i = self.watchlist.position(symbol)
+        if i >= 0:
+            self._tape_scroll = offsets[i] + into
+        elif x:
+            self._tape_scroll %= x
+
+    def _tape_step(self):
+        now = time.perf_counter()
+        self._tape_scroll += (now - self._tape_last) * max(1, config.get("ticker_speed", 60))
+        self._tape_last = now
+        _, length = self._tape_layout()
+        if length:
+            self._tape_scroll %= length
+        self.update(self.rect().adjusted(1, 1, -1, -1))
+
+    def _tape_visible(self):
+        # (index, x) of every item inside the viewport
+        offsets, length = self._tape_layout()
+        if not length:
+            return
+        left = self._tape_scroll
+        right = left + self.width()
+        lap = 0.0
+        # the tape wraps, so a wide viewport may span the end of one lap and the start of the next
+        while lap < right:
+            i = max(0, bisect_right(offsets, left - lap) - 1)
+            while i < len(offsets) and offsets[i] + lap < right:
+                yield i, self.PADDING + offsets[i] + lap - left
+                i += 1
+            lap += length
+
+    def _paint_tape(self, painter):
+        painter.setClipRect(self.rect().adjusted(1, 1, -1, -1))
+        for i, x in self._tape_visible():
+            painter.drawPixmap(int(x), 0, self._slide_pixmap(self.watchlist.at(i), 255))
+
+    def _grid_page_size(self) -> int:
+        return max(1, int(config.get("grid_columns", 3))) * max(1, int(config.get("grid_rows", 4)))
+
+    def _grid_records(self) -> list:
+        per_page = self._grid_page_size()
+        return self.watchlist.slice(self._grid_page * per_page, (self._grid_page + 1) * per_page)
+
+    def _next_grid_page(self):
+        pages = max(1, math.ceil(len(self.watchlist) / self._grid_page_size()))
+        if pages < 2:
+            return
+        self._grid_page = (self._grid_page + 1) % pages
+        self._resize_to_content()
         self.update()
 
+    def _paint_grid(self, painter):
+        cell_w, cell_h = self._grid_cell
+        columns = max(1, int(config.get("grid_columns", 3)))
+        for n, record in enumerate(self._grid_records()):
+            row, col = divmod(n, columns)
+            x = self.PADDING + col * cell_w
+            y = self.PADDING // 2 + row * cell_h
+            painter.drawPixmap(x, y, self._slide_pixmap(record, 255, cell_h))
+
     # --- painting ---
+    def _slide_font(self):
+        text_size = config.get("text_size",24)
+        if self._font_cache is None or self._font_cache[0] != text_size:
+            font = QFont("Calibri", text_size)
+            self._font_cache = (text_size, font, QFontMetrics(font))
+        return self._font_cache[1], self._font_cache[2]
+
+    def _trend_width(self) -> int:
+        # fixed width so the sparkline never makes the slide jitter as the change text varies
+        if not config.get("sparkline_enabled", True):
+            return 0
+        return int(config.get("text_size",24)*2.6) + self.PADDING
+
+    def _paint_trend(self, p, record, x, height):
+        hist = self.history.get(record.symbol)
+        width = self._trend_width() - self.PADDING
+        text_size = config.get("text_size",24)
+        if hist is None or len(hist) < 2:
+            return
+        span = float(config.get("history_hours", 24)) * 3600
+        change = hist.change_pct(span)
+        color = QColor(90,200,120) if (change or 0) >= 0 else QColor(230,90,90)
+        top = height//2 - int(text_size*0.1)
+        line_h = max(4, int(text_size*0.55))
+        values = hist.sparkline(max(2, width//2), span)
+        if values:
+            step = width / (len(values) - 1)
+            line = QPolygonF([QPointF(x + i*step, top + line_h*(1 - v)) for i, v in enumerate(values)])
+            p.setPen(QPen(color, max(1.0, text_size/16)))
+            p.drawPolyline(line)
+        if change is not None:
+            small = QFont("Calibri", max(7, int(text_size*0.45)))
+            p.setFont(small)
+            p.setPen(color)
+            p.drawText(QRect(x, 0, width, top - 2), Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignBottom,
+                       f"{change:+.2f}%")
+
+    def _price_text(self, record, placeholder="...") -> str:
+        return f"{record.price:.{record.decimals}f}" if record.price is not None else placeholder
+
+    def _slide_pixmap(self, record, alpha, height=None):
+        # slides are laid out once per (price, decimals, text size, DPR, icon) and then only blitted
+        symbol = record.symbol
+        decimals = record.decimals
+        text_size = config.get("text_size",24)
+        price_text = self._price_text(record)
+        dpr = self.devicePixelRatioF()
+        height = self.height() if height is None else height
+        icon_size = int(text_size*1.7)
+        icon = self._icon_pixmap(record, icon_size)
+        hist = self.history.get(symbol)
+        trend = (self._trend_width(), hist.version if hist is not None else 0)
+        key = (price_text, decimals, text_size, dpr, height, icon.cacheKey(), trend, record.stale)
+        cached = self._slide_cache.get((symbol, alpha))
+        if cached is not None and cached[0] == key:
+            self._slide_cache.move_to_end((symbol, alpha))
+            metrics.inc("slide_cache_total", {"result": "hit"})
+            return cached[1]
+        metrics.inc("slide_cache_total", {"result": "miss"})
+        font, fm = self._slide_font()
+        symbol_x = icon_size + self.PADDING
+        price_x = symbol_x + fm.horizontalAdvance(record.base) + self.PADDING
+        trend_x = price_x + fm.horizontalAdvance(price_text) + self.PADDING
+        width = trend_x - self.PADDING + self._trend_width()
+        pix = QPixmap(math.ceil(width*dpr), math.ceil(height*dpr))
+        pix.setDevicePixelRatio(dpr)
+        pix.fill(QColor(0,0,0,0))
+        p = QPainter(pix)
+        p.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+        p.drawPixmap(0,(height-icon_size)//2,icon)
+        p.setFont(font)
+        p.setPen(QColor(255,255,255,alpha))
+        y_pos = height//2+fm.ascent()//3
+        p.drawText(symbol_x,y_pos,record.base)
+        if record.stale:
+            # last good price, kept while its symbol is failing or backed off
+            p.setPen(QColor(255,255,255,alpha//2))
+        p.drawText(price_x,y_pos,price_text)
+        if trend[0]:
+            self._paint_trend(p, record, trend_x, height)
+        p.end()
+        self._slide_cache[(symbol, alpha)] = (key, pix)
+        self._slide_cache.move_to_end((symbol, alpha))
+        # bounded, so scrolling a long tape keeps only recently visible slides around
+        while len(self._slide_cache) > self.SLIDE_CACHE_MAX:
+            self._slide_cache.popitem(last=False)
+        return pix
+
+    def _layout_metrics(self) -> QFontMetrics:
+        text_size = config.get("text_size",24)
+        if self._layout_fm is None or self._layout_fm[0] != text_size:
+            self._layout_fm = (text_size, QFontMetrics(QFont("Arial", text_size)))
+        return self._layout_fm[1]
+
     def _resize_to_content(self):
-        font=QFont("Arial",config.get("text_size",24))
-        fm=QFontMetrics(font)
-        slide = self.slides[self.symbols[self.current_index]]
-        price_text = f"{slide['price']:.{self.decimals[self.current_index]}f}" if slide["price"] is not None else "0000.00"
-        symbol_width=fm.horizontalAdvance(slide["symbol"])
-        price_width=fm.horizontalAdvance(price_text)
+        fm=self._layout_metrics()
         icon_size=int(config.get("text_size",24)*1.7)
-        total_width=symbol_width+price_width+icon_size+self.PADDING*3
-        total_height=max(fm.height(),icon_size)+self.PADDING*2
+        mode = self._display_mode()
+        if mode == "ticker":
+            total_width=max(200, int(config.get("ticker_width",480)))
+            total_height=max(fm.height(),icon_size)+self.PADDING*2
+        elif mode == "grid":
+            # only the records on the visible page are measured
+            _, slide_fm = self._slide_font()
+            records = self._grid_records()
+            columns = max(1, min(int(config.get("grid_columns",3)), len(records)))
+            cell_w = max([self._item_width(r, slide_fm) for r in records] or [icon_size]) + self.PADDING
+            cell_h = max(fm.height(),icon_size)+self.PADDING
+            self._grid_cell = (cell_w, cell_h)
+            total_width=columns*cell_w+self.PADDING
+            total_height=math.ceil(len(records)/columns)*cell_h+self.PADDING
+        else:
+            record = self.watchlist.at(self.current_index)
+            price_text = self._price_text(record, "0000.00")
+            symbol_width=fm.horizontalAdvance(record.base)
+            price_width=fm.horizontalAdvance(price_text)
+            total_width=symbol_width+price_width+icon_size+self.PADDING*3+self._trend_width()
+            total_height=max(fm.height(),icon_size)+self.PADDING*2
         self.setMinimumSize(total_width,total_height)
         self.resize(total_width,total_height)
 
     def paintEvent(self,event):
+        t0 = time.perf_counter()
+        if not self._started:
+            startup.mark("first_paint")
+            QTimer.singleShot(0, self._start_background)
         painter=QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         rect=self.rect()
@@ -415,37 +3643,32 @@ class CryptoWidget(QWidget):
         painter.setBrush(bg_color)
         painter.setPen(QColor(50,50,50,max(80,bg_alpha)))
         painter.drawRoundedRect(rect.adjusted(0,0,-1,-1),5,5)
-        font=QFont("Calibri",config.get("text_size",24))
-        painter.setFont(font)
-        fm=QFontMetrics(font)
-        y_pos=self.height()//2+fm.ascent()//3
+
+        mode = self._display_mode()
+        self._paint_content(painter, mode)
+        if self._flashes:
+            self._paint_flashes(painter, mode)
+        # measured before the overlay so it does not count itself
+        metrics.observe("paint_ms", (time.perf_counter() - t0) * 1000, {"mode": mode})
+        if config.get("metrics_overlay", False):
+            self._paint_overlay(painter)
+
+    def _paint_content(self, painter, mode):
+        if mode == "ticker":
+            self._paint_tape(painter)
+            return
+        if mode == "grid":
+            self._paint_grid(painter)
+            return
 
         # previous slide
         if self.slide_in_progress:
-            prev_slide = self.slides[self.symbols[self.prev_index]]
-            offset = self.slide_offset - self.width()
-            x = int(self.PADDING + offset)
-            painter.setPen(QColor(255,255,255,200))
-            icon_size=int(config.get("text_size",24)*1.7)
-            painter.drawPixmap(x,int((self.height()-icon_size)//2),icon_size,icon_size,prev_slide["icon"])
-            x += icon_size + self.PADDING
-            painter.drawText(x,y_pos,prev_slide["symbol"])
-            x += fm.horizontalAdvance(prev_slide["symbol"]) + self.PADDING
-            price_text = f"{prev_slide['price']:.{self.decimals[self.prev_index]}f}" if prev_slide["price"] is not None else "..."
-            painter.drawText(x,y_pos,price_text)
+            pix = self._slide_pixmap(self.watchlist.at(self.prev_index), 200)
+            painter.drawPixmap(int(self.PADDING + self.slide_offset - self.width()), 0, pix)
 
         # current slide
-        slide = self.slides[self.symbols[self.current_index]]
-        offset = self.slide_offset
-        x = int(self.PADDING + offset)
-        painter.setPen(QColor(255,255,255,255))
-        icon_size=int(config.get("text_size",24)*1.7)
-        painter.drawPixmap(x,int((self.height()-icon_size)//2),icon_size,icon_size,slide["icon"])
-        x += icon_size + self.PADDING
-        painter.drawText(x,y_pos,slide["symbol"])
-        x += fm.horizontalAdvance(slide["symbol"]) + self.PADDING
-        price_text = f"{slide['price']:.{self.decimals[self.current_index]}f}" if slide["price"] is not None else "..."
-        painter.drawText(x,y_pos,price_text)
+        pix = self._slide_pixmap(self.watchlist.at(self.current_index), 255)
+        painter.drawPixmap(int(self.PADDING + self.slide_offset), 0, pix)
 
     # --- input & menu ---
     def mousePressEvent(self,event):
@@ -456,51 +3679,239 @@ class CryptoWidget(QWidget):
             self.move(event.globalPosition().toPoint()-self._drag_pos)
     def mouseReleaseEvent(self,event):
         pos=self.pos()
-        config["pos_x"],config["pos_y"]=pos.x(),pos.y()
-        save_settings()
+        # debounced and written off the GUI thread; a plain click changes nothing and writes nothing
+        settings_store.update({"pos_x": pos.x(), "pos_y": pos.y()})
     def contextMenuEvent(self,event):
         menu=QMenu(self)
         settings_action=QAction("Settings",self)
+        overlay_action=QAction("Performance Overlay",self)
+        overlay_action.setCheckable(True); overlay_action.setChecked(bool(config.get("metrics_overlay",False)))
+        server_action=QAction(f"Serve Metrics on 127.0.0.1:{config.get('metrics_port',47712)}",self)
+        server_action.setCheckable(True); server_action.setChecked(bool(config.get("metrics_server",False)))
         exit_action=QAction("Quit",self)
-        menu.addAction(settings_action); menu.addAction(exit_action)
+        menu.addAction(settings_action); menu.addAction(overlay_action); menu.addAction(server_action)
+        menu.addSeparator(); menu.addAction(exit_action)
         action=menu.exec(event.globalPos())
         if action==settings_action: self.open_settings()
+        elif action in (overlay_action, server_action):
+            self.apply_settings(settings_store.update({
+                "metrics_overlay": overlay_action.isChecked(), "metrics_server": server_action.isChecked(),
+            }))
         elif action==exit_action: QApplication.instance().quit()
     def open_settings(self):
         dlg=SettingsDialog(self)
         dlg.exec()
-    def apply_settings(self):
-        self.symbols=[config["symbol1"],config["symbol2"],config["symbol3"]]
-        self.decimals=[config["decimals1"],config["decimals2"],config["decimals3"]]
-        # reload slides
-        self.slides.clear()
-        for s in self.symbols:
-            self.slides[s] = {
-                "icon": make_fallback_pixmap(s.replace("USDT",""),size=128),
-                "symbol": s.replace("USDT",""),
-                "price": None
-            }
-        self.current_index=0
-        self.slide_offset=0
-        self.slide_in_progress=False
-        self.reload_icons_async()
-        self.update_prices()
-        self._resize_to_content()
-        self.update()
-        self.update_timer.stop(); self.update_timer.start(max(5,config.get("update_interval",30))*1000)
-        self.cycle_timer.stop()
-        if config.get("cycle_enabled",True):
-            self.cycle_timer.start(max(3,config.get("cycle_interval",3))*1000)
+    # settings keys grouped by the part of the widget that has to react to them
+    SETTINGS_GROUPS = {
+        "display": {"display_mode", "text_size", "ticker_width", "grid_columns", "grid_rows", "sparkline_enabled"},
+        "repaint": {"bg_opacity", "ticker_speed"},
+        "polling": {"update_interval", "offscreen_interval_factor", "max_backoff", "rate_limit_weight",
+                    "rate_limit_budget"},
+        "stream": {"stream_enabled", "stream_kind"},
+        "feed": {"feed_enabled", "feed_port"},
+        "metrics": {"metrics_overlay", "metrics_server", "metrics_port"},
+        "cycle": {"cycle_enabled", "cycle_interval"},
+        "position": {"pos_x", "pos_y"},
+        "http": {"http_connect_timeout", "http_read_timeout", "http_retries", "http_backoff", "http_pool_per_host"},
+        "icons": {"icon_cache_mb"},
+        "alerts": {"alerts"},
+        "history": {"history_hours", "history_points"},
+        "ticks": {"tick_retention_hours", "tick_store_mb"},
+        "scheduler": {"max_concurrent_fetches"},
+    }
+
+    def apply_settings(self, changed=None):
+        # changed: the keys that differ from what is applied; None reapplies everything
+        if changed is not None and not changed:
+            return
+        groups = {g for g, keys in self.SETTINGS_GROUPS.items() if changed is None or keys & changed}
+        symbols = changed is None or "watchlist" in changed
+        if symbols:
+            self._apply_watchlist()
+        if "polling" in groups:
+            self._configure_poller()
+        if "display" in groups:
+            self._apply_display_mode()
+        elif symbols:
+            self._resize_to_content()
+            self.update()
+        elif "repaint" in groups:
+            self.update()
+        if symbols or "stream" in groups:
+            self._setup_stream()
+        if symbols or "feed" in groups:
+            self._setup_feed()
+        if "metrics" in groups:
+            self._setup_metrics()
+        if "position" in groups:
+            self.move(config.get("pos_x",200), config.get("pos_y",200))
+        if "http" in groups:
+            reset_transport()
+        if "icons" in groups:
+            icon_cache.max_bytes = int(config.get("icon_cache_mb", 16) * 1024 * 1024)
+        if "alerts" in groups:
+            self.alerts.set_rules(self._alert_rules())
+        if "history" in groups:
+            self._apply_history()
+        if "ticks" in groups:
+            self.tick_store.retention = float(config.get("tick_retention_hours", 72)) * 3600
+            self.tick_store.max_bytes = int(config.get("tick_store_mb", 32) * 1024 * 1024)
+        if "scheduler" in groups:
+            self.scheduler.set_max_concurrency(config.get("max_concurrent_fetches", 4))
+        if symbols or groups & {"polling", "stream", "feed"}:
+            self._schedule_poll()
+        if "cycle" in groups:
+            self.cycle_timer.stop()
+            if config.get("cycle_enabled",True):
+                self.cycle_timer.start(max(3,config.get("cycle_interval",3))*1000)
+
+    def _apply_watchlist(self):
+        current = self.watchlist.at(self.current_index).symbol if len(self.watchlist) else None
+        tape_widths, tape_anchor = self._tape_widths()
+        added, removed = self.watchlist.set_entries(watchlist_entries())
+        # drop fetches and rendered slides for symbols that are no longer shown
+        if removed:
+            keep = self.watchlist.symbols
+            self.scheduler.cancel("price", keep=keep)
+            self.scheduler.cancel("icon", keep=keep)
+            self.scheduler.cancel("icon_refresh", keep=keep)
+            self._icon_pending.difference_update(removed)
+            for symbol in removed:
+                self.history.pop(symbol, None)
+                self._flashes.pop(symbol, None)
+            self.alerts.forget(removed)
+            for key in [k for k in self._slide_cache if k[0] not in self.watchlist]:
+                del self._slide_cache[key]
+        self.current_index=max(0, self.watchlist.position(current))
+        self.slide_anim.stop()
+        self.slide_offset = 0
+        self.slide_in_progress = False
+        if tape_widths is not None:
+            self._patch_tape(tape_widths, tape_anchor)
+        pages = max(1, math.ceil(len(self.watchlist) / self._grid_page_size()))
+        self._grid_page = min(self._grid_page, pages - 1)
+        if added:
+            self._replay_history(added)
+            self.reload_icons_async(added)
+        self._configure_poller()
+        if added:
+            self.update_prices(added)
+
+    # --- settings file ---
+    def _watch_settings(self):
+        # the directory catches atomic replaces (ours and editors'); the file catches in-place writes
+        folder = os.path.dirname(SETTINGS_FILE) or "."
+        if folder not in self.settings_watcher.directories():
+            self.settings_watcher.addPath(folder)
+        if os.path.exists(SETTINGS_FILE) and SETTINGS_FILE not in self.settings_watcher.files():
+            self.settings_watcher.addPath(SETTINGS_FILE)
+
+    def _on_settings_path_changed(self, path):
+        if path == SETTINGS_FILE or os.path.exists(SETTINGS_FILE):
+            self.settings_reload_timer.start()
+
+    def _reload_settings_from_disk(self):
+        self._watch_settings()
+        changed = settings_store.reload_if_changed()
+        if changed:
+            self.apply_settings(changed)
 
 # ---------- app entry ----------
+def _print_json(obj):
+    sys.stdout.write(json.dumps(obj, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+def run_daemon(symbols, port: int, quiet: bool = False):
+    try:
+        daemon = PriceDaemon(symbols, port=port, on_tick=None if quiet else _print_json)
+    except OSError as e:
+        sys.stderr.write(f"crypto-widget: cannot serve prices on port {port}: {e.strerror or e}\n")
+        sys.exit(1)
+    if config.get("metrics_server", False):
+        try:
+            MetricsServer(metrics, port=int(config.get("metrics_port", 47712))).start()
+        except OSError:
+            sys.stderr.write("crypto-widget: metrics port in use, not serving metrics\n")
+    sys.stderr.write(f"crypto-widget: serving prices on {daemon.hub.address[0]}:{daemon.hub.address[1]}\n")
+    daemon.run()
+
+def run_stream(symbols, port: int):
+    # prefer a running daemon; otherwise poll on our own like a one-instance daemon would
+    try:
+        for tick in read_feed(symbols, port=port):
+            if tick.get("type") == "tick":
+                _print_json(tick)
+        return
+    except OSError:
+        pass
+    symbols = list(symbols) or [x for x, _ in watchlist_entries()]
+    poller = PollScheduler(max(5, config.get("update_interval", 30)), 1, config.get("max_backoff", 300))
+    poller.set_symbols(symbols)
+    while True:
+        due = poller.due(time.time(), set(symbols))
+        if due:
+            meta = {}
+            try:
+                prices = fetch_prices(due, meta=meta)
+            except RateLimitError as e:
+                poller.pause(e.retry_after, time.time())
+                prices = e.prices
+            except Exception:
+                prices = {x: None for x in due}
+            now = time.time()
+            poller.record_success([x for x in due if prices.get(x) is not None], now, set(symbols))
+            poller.record_failure([x for x in due if prices.get(x) is None], now, set(symbols))
+            for x in due:
+                _print_json({"type": "tick", "symbol": x, "price": prices.get(x), "ts": round(now, 3),
+                             "source": meta.get("sources", {}).get(x)})
+        time.sleep(max(0.25, poller.next_wakeup(time.time(), set(symbols)) or 1))
+
+def run_cli(argv) -> bool:
+    # returns False when no headless flag was given and the GUI should start
+    parser = argparse.ArgumentParser(prog="crypto-widget", description="Crypto price widget")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--daemon", action="store_true", help="poll once for every widget and serve ticks on a local port")
+    mode.add_argument("--once", action="store_true", help="print current prices as one JSON object and exit")
+    mode.add_argument("--stream", action="store_true", help="print JSON ticks, one per line")
+    parser.add_argument("--port", type=int, default=None, help="local feed port (default: feed_port setting)")
+    parser.add_argument("--quiet", action="store_true", help="daemon only: do not echo ticks to stdout")
+    parser.add_argument("symbols", nargs="*", help="symbols such as BTCUSDT or eth-usdt (default: watchlist)")
+    args, _ = parser.parse_known_args(argv)
+    if not (args.daemon or args.once or args.stream):
+        return False
+    load_settings()
+    symbols = [canonical_symbol(x) for x in args.symbols]
+    port = args.port if args.port is not None else int(config.get("feed_port", 47711))
+    try:
+        if args.daemon:
+            run_daemon(symbols, port, args.quiet)
+        elif args.stream:
+            run_stream(symbols, port)
+        else:
+            symbols = symbols or [x for x, _ in watchlist_entries()]
+            try:
+                prices = fetch_prices(symbols)
+            except RateLimitError as e:
+                sys.stderr.write(f"crypto-widget: {e}\n")
+                prices = {x: e.prices.get(x) for x in symbols}
+            _print_json(prices)
+    except KeyboardInterrupt:
+        pass
+    return True
+
 def main():
+    if run_cli(sys.argv[1:]):
+        return
     load_settings()
     app=QApplication(sys.argv)
     app.setApplicationName("Crypto Widget")
     app.setStyleSheet("QWidget { font-family: Arial; }")
+    app.aboutToQuit.connect(settings_store.flush)
     widget=CryptoWidget()
     widget.show()
     sys.exit(app.exec())
 
+startup.mark("import")
+
 if __name__=="__main__":
     main()
@@ -0,0 +1,69 @@
+# Shared fixtures: one local stub exchange and one copy of the widget module per session,
+# loaded the same way the benchmarks load it.
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+from bench_widget import load_module  # noqa: E402
+from stub_exchange import StubExchange  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def stub():
+    server = StubExchange(symbols=20).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def cw(stub, tmp_path_factory):
+    module = load_module(stub, str(tmp_path_factory.mktemp("home")))
+    # failures should show up as failures, not as urllib3 retry sleeps
+    module.config["http_retries"] = 0
+    module.reset_transport()
+    return module
+
+
+@pytest.fixture(autouse=True)
+def reset_stub(stub):
+    yield
+    stub.responses.clear()
+    stub.path_latency.clear()
+    stub.okx_symbols = None
+    stub.log.clear()
+
+
+@pytest.fixture(scope="session")
+def app(cw):
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def pump(app):
+    def run(until, timeout=5.0):
+        end = time.monotonic() + timeout
+        while not until():
+            if time.monotonic() > end:
+                raise AssertionError("timed out waiting for the event loop")
+            app.processEvents()
+            time.sleep(0.005)
+    return run
+
+
+@pytest.fixture
+def widget(cw, app, monkeypatch, pump):
+    for key in ("watchlist", "display_mode"):
+        monkeypatch.setitem(cw.config, key, cw.config[key])
+    w = cw.CryptoWidget()
+    yield w
+    w.update_timer.stop()
+    pump(lambda: not any(w.scheduler.stats()[k] for k in ("in_flight", "queued")))
+    w.scheduler.shutdown()
+    w.close()
+    w.deleteLater()
+    app.processEvents()
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+
+def wait_for(check, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def scheduler(cw):
+    s = cw.FetchScheduler(max_concurrency=2)
+    s.start()
+    yield s
+    s.shutdown()
+
+
+def test_stats_count_queued_and_running_jobs(scheduler):
+    release = threading.Event()
+    done = []
+    for i in range(5):
+        scheduler.submit("price", [f"C{i}USDT"], lambda items: release.wait(5), lambda *a: done.append(a))
+    wait_for(lambda: scheduler.stats()["in_flight"] == 2)
+    assert scheduler.stats()["queued"] == 3
+    scheduler.cancel("price", keep=["C0USDT", "C1USDT"])
+    wait_for(lambda: scheduler.stats()["queued"] == 0)
+    release.set()
+    wait_for(lambda: scheduler.stats()["in_flight"] == 0)
+    stats = scheduler.stats()
+    assert (stats["completed"], stats["cancelled"]) == (2, 3)
+
+
+def test_stats_can_be_read_while_jobs_come_and_go(scheduler):
+    stop = threading.Event()
+    errors = []
+
+    def churn():
+        i = 0
+        while not stop.is_set():
+            scheduler.submit("icon", [f"C{i}"], lambda items: None, lambda *a: None)
+            i += 1
+            time.sleep(0.0001)
+
+    thread = threading.Thread(target=churn)
+    thread.start()
+    try:
+        end = time.monotonic() + 0.5
+        while time.monotonic() < end:
+            try:
+                scheduler.stats()
+            except RuntimeError as e:
+                errors.append(e)
+    finally:
+        stop.set()
+        thread.join()
+    assert not errors
+    wait_for(lambda: not scheduler.stats()["in_flight"] and not scheduler.stats()["queued"])
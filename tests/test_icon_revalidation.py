@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+
+import pytest
+
+ICON_PATH = "/static/assets/logos/BTC.png"
+
+
+def png(app, color):
+    from PyQt6.QtCore import QBuffer, QIODevice
+    from PyQt6.QtGui import QColor, QImage
+    img = QImage(16, 16, QImage.Format.Format_ARGB32)
+    img.fill(QColor(color))
+    buf = QBuffer()
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    img.save(buf, "PNG")
+    return bytes(buf.data())
+
+
+def clear_icons(cw):
+    cw.icon_cache.clear()
+    shutil.rmtree(cw.ICON_CACHE_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def icon(cw, stub, app):
+    clear_icons(cw)
+    stub.icons["BTC.png"] = png(app, "orange")
+    images = cw.load_icon_images(["BTCUSDT"])
+    assert images["BTCUSDT"] is not None
+    stub.log.clear()
+    yield
+    stub.icons.pop("BTC.png", None)
+    clear_icons(cw)
+
+
+def test_first_load_stores_icon_and_validators(cw, stub, icon):
+    meta = cw.read_icon_meta("BTCUSDT")
+    assert meta["etag"] and meta["sha256"]
+    assert os.path.exists(cw.icon_cache_path("BTCUSDT"))
+    # the disk tier answers the next load without a request
+    assert cw.load_icon_images(["BTCUSDT"])["BTCUSDT"] is not None
+    assert stub.log == []
+
+
+def test_fresh_icons_are_not_revalidated(cw, stub, icon):
+    assert cw.revalidate_icons(["BTCUSDT"]) == {}
+    assert stub.log == []
+
+
+def test_unchanged_icon_gets_304_and_a_new_timestamp(cw, stub, icon):
+    before = cw.read_icon_meta("BTCUSDT")["fetched_at"]
+    assert cw.revalidate_icons(["BTCUSDT"], force=True) == {}
+    assert stub.log == [(ICON_PATH, 304)]
+    assert cw.read_icon_meta("BTCUSDT")["fetched_at"] > before
+
+
+def test_expired_icon_is_revalidated(cw, stub, icon):
+    meta = cw.read_icon_meta("BTCUSDT")
+    meta["fetched_at"] -= 48 * 3600
+    cw.write_icon_meta("BTCUSDT", meta)
+    assert cw.revalidate_icons(["BTCUSDT"]) == {}
+    assert stub.log == [(ICON_PATH, 304)]
+
+
+def test_changed_icon_is_downloaded_and_returned(cw, stub, app, icon):
+    old_sha = cw.read_icon_meta("BTCUSDT")["sha256"]
+    stub.icons["BTC.png"] = png(app, "purple")
+    changed = cw.revalidate_icons(["BTCUSDT"], force=True)
+    assert list(changed) == ["BTCUSDT"]
+    assert stub.log == [(ICON_PATH, 200)]
+    with open(cw.icon_cache_path("BTCUSDT"), "rb") as fh:
+        assert fh.read() == stub.icons["BTC.png"]
+    assert cw.read_icon_meta("BTCUSDT")["sha256"] != old_sha
+
+
+def test_full_response_with_same_bytes_is_not_reported(cw, stub, icon):
+    # without validators the server sends the whole icon; identical bytes are not a change
+    meta = cw.read_icon_meta("BTCUSDT")
+    meta.pop("etag")
+    with open(cw.icon_meta_path("BTCUSDT"), "w") as fh:
+        json.dump(meta, fh)
+    assert cw.revalidate_icons(["BTCUSDT"], force=True) == {}
+    assert stub.log == [(ICON_PATH, 200)]
+    assert cw.read_icon_meta("BTCUSDT")["etag"]
+
+
+def test_corrupted_cache_file_is_downloaded_again(cw, stub, icon):
+    with open(cw.icon_cache_path("BTCUSDT"), "r+b") as fh:
+        fh.truncate(10)
+    assert cw.load_icon_images(["BTCUSDT"])["BTCUSDT"] is not None
+    assert stub.log == [(ICON_PATH, 200)]
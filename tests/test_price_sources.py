@@ -0,0 +1,122 @@
+import time
+
+import pytest
+
+BINANCE = "/api/v3/ticker/price"
+OKX = "/api/v5/market/tickers"
+
+
+def hits(stub, path):
+    return sum(1 for p, _ in stub.log if p == path)
+
+
+def test_binance_prices_a_batch_in_one_request(cw, stub):
+    meta = {}
+    prices = cw.BinanceSource(stub.url).fetch(["BTCUSDT", "ETHUSDT"], meta=meta)
+    assert prices == {"BTCUSDT": pytest.approx(stub.prices["BTCUSDT"]), "ETHUSDT": pytest.approx(stub.prices["ETHUSDT"])}
+    assert hits(stub, BINANCE) == 1
+    assert meta["used_weight"] == 4
+
+
+def test_binance_unknown_symbol_falls_back_to_snapshot(cw, stub):
+    prices = cw.BinanceSource(stub.url).fetch(["BTCUSDT", "NOPEUSDT"])
+    assert prices["BTCUSDT"] == pytest.approx(stub.prices["BTCUSDT"])
+    assert prices["NOPEUSDT"] is None
+    assert [status for _, status in stub.log] == [400, 200]
+
+
+def test_binance_rate_limit_raises_with_retry_after(cw, stub):
+    stub.responses[BINANCE] = (429, {"Retry-After": "7", "X-MBX-USED-WEIGHT-1M": "6100"})
+    with pytest.raises(cw.RateLimitError) as info:
+        cw.BinanceSource(stub.url).fetch(["BTCUSDT"])
+    assert info.value.retry_after == 7
+    assert info.value.used_weight == 6100
+
+
+def test_okx_maps_dashed_instrument_ids(cw, stub):
+    prices = cw.OkxSource(stub.url).fetch(["BTCUSDT", "SOLUSDT", "NOPEUSDT"])
+    assert prices["BTCUSDT"] == pytest.approx(stub.prices["BTCUSDT"])
+    assert prices["SOLUSDT"] == pytest.approx(stub.prices["SOLUSDT"])
+    assert prices["NOPEUSDT"] is None
+
+
+def test_failover_moves_to_next_source_on_error(cw, stub):
+    stub.responses[BINANCE] = (503, {})
+    router = cw.PriceRouter([cw.BinanceSource(stub.url), cw.OkxSource(stub.url)], cooldown=30)
+    meta = {}
+    prices = router.fetch(["BTCUSDT", "ETHUSDT"], meta=meta)
+    assert prices["BTCUSDT"] == pytest.approx(stub.prices["BTCUSDT"])
+    assert meta["sources"] == {"BTCUSDT": "okx", "ETHUSDT": "okx"}
+    # binance now sits out its cooldown instead of being asked first again
+    router.fetch(["BTCUSDT"])
+    assert hits(stub, BINANCE) == 1
+    assert router.stats()["binance"]["down_for"] > 0
+
+
+def test_failover_fills_gaps_from_next_source(cw, stub):
+    stub.okx_symbols = {"BTCUSDT"}
+    router = cw.PriceRouter([cw.OkxSource(stub.url), cw.BinanceSource(stub.url)])
+    meta = {}
+    prices = router.fetch(["BTCUSDT", "ETHUSDT"], meta=meta)
+    assert all(p is not None for p in prices.values())
+    assert meta["sources"] == {"BTCUSDT": "okx", "ETHUSDT": "binance"}
+
+
+def test_rate_limited_source_is_skipped_and_its_limit_reported(cw, stub):
+    stub.responses[BINANCE] = (429, {"Retry-After": "120"})
+    stub.okx_symbols = {"BTCUSDT"}
+    router = cw.PriceRouter([cw.BinanceSource(stub.url), cw.OkxSource(stub.url)])
+    for _ in range(3):
+        with pytest.raises(cw.RateLimitError) as info:
+            router.fetch(["BTCUSDT", "ETHUSDT"])
+        # what the other source priced still comes back with the error
+        assert info.value.prices == {"BTCUSDT": pytest.approx(stub.prices["BTCUSDT"])}
+        assert info.value.retry_after > 100
+    assert hits(stub, BINANCE) == 1
+    assert hits(stub, OKX) == 3
+    # symbols the other source covers need nothing from the limited one
+    assert router.fetch(["BTCUSDT"])["BTCUSDT"] is not None
+
+
+def test_all_sources_failing_raises(cw, stub):
+    stub.responses[BINANCE] = (503, {})
+    stub.responses[OKX] = (503, {})
+    router = cw.PriceRouter([cw.BinanceSource(stub.url), cw.OkxSource(stub.url)])
+    with pytest.raises(Exception):
+        router.fetch(["BTCUSDT"])
+
+
+def test_race_takes_the_faster_source(cw, stub):
+    stub.path_latency[BINANCE] = 0.3
+    router = cw.PriceRouter([cw.BinanceSource(stub.url), cw.OkxSource(stub.url)], mode="race")
+    meta = {}
+    t0 = time.perf_counter()
+    prices = router.fetch(["BTCUSDT", "ETHUSDT"], meta=meta)
+    assert time.perf_counter() - t0 < 0.25
+    assert set(meta["sources"].values()) == {"okx"}
+    assert all(p is not None for p in prices.values())
+    # the slower request keeps running so its latency is still measured
+    deadline = time.monotonic() + 2
+    while router.stats()["binance"]["ok"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert router.stats()["binance"]["latency_ms"] >= 300
+    assert [s.name for s in router.ranked()] == ["okx", "binance"]
+
+
+def test_race_falls_through_when_the_winner_misses_symbols(cw, stub):
+    stub.okx_symbols = {"BTCUSDT"}
+    stub.path_latency[BINANCE] = 0.2
+    router = cw.PriceRouter([cw.BinanceSource(stub.url), cw.OkxSource(stub.url)], mode="race")
+    meta = {}
+    prices = router.fetch(["BTCUSDT", "ETHUSDT"], meta=meta)
+    assert all(p is not None for p in prices.values())
+    assert meta["sources"]["BTCUSDT"] == "okx"
+
+
+def test_race_reports_the_winners_used_weight(cw, stub):
+    stub.path_latency[OKX] = 0.3
+    router = cw.PriceRouter([cw.BinanceSource(stub.url), cw.OkxSource(stub.url)], mode="race")
+    meta = {}
+    router.fetch(["BTCUSDT", "ETHUSDT"], meta=meta)
+    assert set(meta["sources"].values()) == {"binance"}
+    assert meta["used_weight"] == 4
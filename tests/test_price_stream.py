@@ -0,0 +1,141 @@
+import json
+
+import pytest
+
+QtWebSockets = pytest.importorskip("PyQt6.QtWebSockets")
+
+
+class StreamServer:
+    # stand-in for the Binance combined stream on a loopback port
+    def __init__(self):
+        from PyQt6.QtNetwork import QHostAddress
+        self.server = QtWebSockets.QWebSocketServer("stub-stream", QtWebSockets.QWebSocketServer.SslMode.NonSecureMode)
+        assert self.server.listen(QHostAddress(QHostAddress.SpecialAddress.LocalHost), 0)
+        self.server.newConnection.connect(self._accept)
+        self.clients = []
+        self.urls = []
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.server.serverPort()}"
+
+    def _accept(self):
+        sock = self.server.nextPendingConnection()
+        self.clients.append(sock)
+        self.urls.append(sock.requestUrl().toString())
+
+    def send(self, payload):
+        for sock in self.clients:
+            sock.sendTextMessage(json.dumps(payload))
+
+    def drop_clients(self):
+        for sock in self.clients:
+            sock.close()
+        self.clients = []
+
+    def close(self):
+        self.drop_clients()
+        self.server.close()
+
+
+@pytest.fixture
+def server(app):
+    srv = StreamServer()
+    yield srv
+    srv.close()
+
+
+def make_stream(cw, server, kind="miniTicker"):
+    stream = cw.PriceStream(base_url=server.url, kind=kind)
+    stream.RECONNECT_MIN_MS = 20
+    received = []
+    stream.prices_received.connect(received.append)
+    return stream, received
+
+
+def test_stream_subscribes_and_parses_mini_ticker(cw, server, pump):
+    stream, received = make_stream(cw, server)
+    stream.start(["BTCUSDT", "ETHUSDT"])
+    pump(lambda: stream.is_connected and server.clients)
+    assert "streams=btcusdt@miniTicker/ethusdt@miniTicker" in server.urls[0]
+    server.send({"stream": "btcusdt@miniTicker", "data": {"s": "BTCUSDT", "c": "65001.5"}})
+    server.send({"stream": "dogeusdt@miniTicker", "data": {"s": "DOGEUSDT", "c": "0.1"}})
+    server.send("not json")
+    pump(lambda: received)
+    stream.stop()
+    assert received == [{"BTCUSDT": 65001.5}]
+
+
+def test_stream_book_ticker_uses_mid_price(cw, server, pump):
+    stream, received = make_stream(cw, server, kind="bookTicker")
+    stream.start(["ETHUSDT"])
+    pump(lambda: stream.is_connected and server.clients)
+    server.send({"data": {"s": "ETHUSDT", "b": "100", "a": "102"}})
+    pump(lambda: received)
+    stream.stop()
+    assert received == [{"ETHUSDT": 101.0}]
+
+
+def test_stream_reconnects_after_a_drop(cw, server, pump):
+    stream, _ = make_stream(cw, server)
+    events = []
+    stream.connected.connect(lambda: events.append("up"))
+    stream.disconnected.connect(lambda: events.append("down"))
+    stream.start(["BTCUSDT"])
+    pump(lambda: events == ["up"])
+    server.drop_clients()
+    pump(lambda: events == ["up", "down", "up"])
+    stream.stop()
+    assert len(server.urls) == 2
+
+
+def test_stream_backs_off_while_the_server_is_gone(cw, server, pump):
+    stream, _ = make_stream(cw, server)
+    server.close()
+    stream.start(["BTCUSDT"])
+    pump(lambda: stream._backoff_ms >= 80)
+    stream.stop()
+    assert not stream.is_connected
+
+
+def test_widget_falls_back_to_polling_when_the_stream_drops(cw, stub, server, app, pump, monkeypatch):
+    monkeypatch.setattr(cw, "BINANCE_STREAM_URL", server.url)
+    monkeypatch.setitem(cw.config, "stream_enabled", True)
+    monkeypatch.setitem(cw.config, "update_interval", 5)
+    widget = cw.CryptoWidget()
+    try:
+        widget._start_background()
+        pump(lambda: widget.price_stream.is_connected)
+        pump(lambda: not widget.scheduler.stats()["in_flight"])
+        app.processEvents()
+        assert not widget.update_timer.isActive()
+        # pushed prices land on the records like polled ones
+        server.send({"data": {"s": "BTCUSDT", "c": "70000"}})
+        pump(lambda: widget.watchlist.get("BTCUSDT").price == 70000.0)
+        stub.log.clear()
+        server.close()
+        pump(lambda: ("/api/v3/ticker/price", 200) in stub.log)
+        # re-armed once the fallback fetch has been applied
+        pump(widget.update_timer.isActive)
+    finally:
+        widget.price_stream.stop()
+        widget.scheduler.shutdown()
+        widget.close()
+        widget.deleteLater()
+
+
+def test_pushed_prices_are_applied_in_batches(app, widget, pump, monkeypatch):
+    resizes = []
+    real = widget._resize_to_content
+    monkeypatch.setattr(widget, "_resize_to_content", lambda: resizes.append(1) or real())
+    current = widget.watchlist.at(widget.current_index).symbol
+    idle = lambda: not any(widget.scheduler.stats()[k] for k in ("in_flight", "queued"))
+    pump(lambda: widget.watchlist.get(current).price is not None and idle())
+    app.processEvents()
+    resizes.clear()
+    for i in range(200):
+        widget._on_pushed_prices({current: 100.0 + i})
+    assert widget.watchlist.get(current).price != 299.0
+    pump(lambda: widget.watchlist.get(current).price == 299.0)
+    assert len(resizes) == 1
+    assert len(widget.history[current]) == 1
@@ -0,0 +1,24 @@
+def test_history_settings_rebuild_histories(cw, widget, monkeypatch):
+    symbol = widget.watchlist.at(0).symbol
+    hist = widget._history_for(symbol)
+    for i in range(50):
+        hist.append(1000.0 + i * 3600, 100.0 + i)
+    monkeypatch.setitem(cw.config, "history_points", 20)
+    monkeypatch.setitem(cw.config, "history_hours", 10)
+    widget.apply_settings({"history_points", "history_hours"})
+    rebuilt = widget.history[symbol]
+    assert rebuilt.capacity == 20
+    assert rebuilt.spacing == 10 * 3600 / 20
+    assert rebuilt.last() == 149.0
+    assert widget.tick_store.min_interval == 10 * 3600 / 20
+
+
+def test_tick_store_and_scheduler_settings_apply_live(cw, widget, pump, monkeypatch):
+    monkeypatch.setitem(cw.config, "tick_retention_hours", 6)
+    monkeypatch.setitem(cw.config, "tick_store_mb", 2)
+    monkeypatch.setitem(cw.config, "max_concurrent_fetches", 9)
+    widget.apply_settings({"tick_retention_hours", "tick_store_mb", "max_concurrent_fetches"})
+    assert widget.tick_store.retention == 6 * 3600
+    assert widget.tick_store.max_bytes == 2 * 1024 * 1024
+    pump(lambda: widget.scheduler.max_concurrency == 9)
+    assert widget.scheduler._executor._max_workers == 9
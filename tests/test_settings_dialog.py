@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture
+def dialog(cw, widget, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(cw.QMessageBox, "warning", lambda parent, title, text: warnings.append(text))
+    dlg = cw.SettingsDialog(widget)
+    dlg.warnings = warnings
+    yield dlg
+    dlg.deleteLater()
+
+
+def test_add_alert_with_only_blank_watchlist_rows(dialog):
+    dialog.watchlist_table.setRowCount(0)
+    dialog._add_watchlist_row("", 2)
+    dialog._on_add_alert()
+    assert dialog.alerts_table.item(dialog.alerts_table.rowCount() - 1, 0).text() == "BTCUSDT"
+
+
+def test_unparseable_alert_price_keeps_the_dialog_open(cw, dialog, monkeypatch):
+    saved = []
+    monkeypatch.setattr(cw.settings_store, "update", lambda values: saved.append(values) or set())
+    dialog.alerts_table.setRowCount(0)
+    dialog._add_alert_row(cw.AlertRule("BTCUSDT", "above", 100.0))
+    dialog.alerts_table.item(0, 2).setText("1oo")
+    dialog._on_save()
+    assert not saved
+    assert len(dialog.warnings) == 1 and "1oo" in dialog.warnings[0]
+    assert (dialog.alerts_table.currentRow(), dialog.alerts_table.currentColumn()) == (0, 2)
+    dialog.alerts_table.item(0, 2).setText("100")
+    dialog._on_save()
+    assert saved[0]["alerts"][0]["price"] == 100.0
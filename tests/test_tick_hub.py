@@ -0,0 +1,101 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+
+def connect(hub, symbols):
+    conn = socket.create_connection(hub.address, timeout=5)
+    conn.sendall((json.dumps({"op": "subscribe", "symbols": symbols}) + "\n").encode())
+    return conn, conn.makefile("r", encoding="utf-8")
+
+
+def wait_for(check, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.01)
+
+
+def ticks(n, price=1.0):
+    return [{"type": "tick", "symbol": f"C{i}USDT", "price": price, "ts": 0.0, "source": "binance"} for i in range(n)]
+
+
+def test_subscriber_gets_hello_snapshot_then_ticks(cw):
+    hub = cw.TickHub("127.0.0.1", 0)
+    hub.start()
+    try:
+        hub.publish(ticks(3))
+        conn, lines = connect(hub, ["C1USDT"])
+        assert json.loads(lines.readline())["type"] == "hello"
+        assert json.loads(lines.readline())["symbol"] == "C1USDT"
+        wait_for(lambda: hub.symbols() == {"C1USDT"})
+        hub.publish(ticks(3, price=2.0))
+        assert json.loads(lines.readline()) == {"type": "tick", "symbol": "C1USDT", "price": 2.0, "ts": 0.0,
+                                                "source": "binance"}
+        conn.close()
+    finally:
+        hub.close()
+
+
+def test_client_that_stops_reading_is_dropped_without_blocking_publish(cw):
+    hub = cw.TickHub("127.0.0.1", 0)
+    hub.start()
+    try:
+        stalled = socket.create_connection(hub.address)
+        stalled.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        stalled.sendall(b'{"op": "subscribe", "symbols": ["*"]}\n')
+        live, lines = connect(hub, ["C0USDT"])
+        wait_for(lambda: hub.client_count() == 2 and "*" in set().union(*(c.wanted for c in hub._clients.values())))
+        t0 = time.perf_counter()
+        for _ in range(300):
+            hub.publish(ticks(500))
+        assert time.perf_counter() - t0 < 5
+        wait_for(lambda: hub.client_count() == 1)
+        assert cw.metrics.counter_total("feed_clients_dropped_total", reason="slow") >= 1
+        # the reader that keeps up is unaffected
+        assert json.loads(lines.readline())["type"] == "hello"
+        assert json.loads(lines.readline())["symbol"] == "C0USDT"
+        stalled.close()
+        live.close()
+    finally:
+        hub.close()
+
+
+def test_daemon_on_a_busy_port_exits_with_one_line(cw, capsys):
+    hub = cw.TickHub("127.0.0.1", 0)
+    try:
+        with pytest.raises(SystemExit) as info:
+            cw.run_daemon([], hub.address[1], quiet=True)
+    finally:
+        hub.close()
+    assert info.value.code == 1
+    err = capsys.readouterr().err
+    assert err.startswith("crypto-widget: cannot serve prices on port") and err.count("\n") == 1
+
+
+def test_feed_client_skips_lines_that_are_not_ticks(cw, app, pump):
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def serve():
+        conn, _ = server.accept()
+        conn.sendall(b'[1, 2]\n"hello"\n{"type": "hello"}\n'
+                     b'{"type": "tick", "symbol": "ETHUSDT", "price": "n/a"}\n'
+                     b'{"type": "tick", "symbol": "BTCUSDT", "price": 70000.0}\n')
+        time.sleep(1)
+        conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    feed = cw.PriceFeed("127.0.0.1", server.getsockname()[1])
+    received = []
+    feed.prices_received.connect(received.append)
+    try:
+        feed.start(["BTCUSDT", "ETHUSDT"])
+        pump(lambda: received)
+        assert feed.is_connected
+        assert received == [{"BTCUSDT": 70000.0}]
+    finally:
+        feed.stop()
+        server.close()
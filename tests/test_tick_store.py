@@ -0,0 +1,40 @@
+import time
+
+
+def test_two_stores_sharing_a_file_agree_on_symbol_ids(cw, tmp_path):
+    # two widget processes on the same ~/crypto_widget_ticks.bin
+    path = str(tmp_path / "ticks.bin")
+    now = time.time()
+    first = cw.TickStore(path, min_interval=0)
+    second = cw.TickStore(path, min_interval=0)
+    first.append("BTCUSDT", now - 30, 65000.0)
+    first.flush()
+    second.append("DOGEUSDT", now - 20, 0.1)
+    second.flush()
+    first.append("ETHUSDT", now - 10, 3200.0)
+    first.append("BTCUSDT", now - 5, 65100.0)
+    first.flush()
+    second.append("DOGEUSDT", now - 1, 0.2)
+    second.flush()
+
+    reader = cw.TickStore(path)
+    assert reader.replay(["BTCUSDT", "DOGEUSDT", "ETHUSDT"], 3600) == {
+        "BTCUSDT": [(now - 30, 65000.0), (now - 5, 65100.0)],
+        "DOGEUSDT": [(now - 20, 0.1), (now - 1, 0.2)],
+        "ETHUSDT": [(now - 10, 3200.0)],
+    }
+    # each store also sees what the other one wrote
+    assert first.last_prices(["DOGEUSDT"]) == {"DOGEUSDT": (now - 1, 0.2)}
+    assert second.last_prices(["BTCUSDT"]) == {"BTCUSDT": (now - 5, 65100.0)}
+
+
+def test_final_flush_writes_throttled_tail(cw, tmp_path):
+    path = str(tmp_path / "ticks.bin")
+    now = time.time()
+    store = cw.TickStore(path, min_interval=60)
+    store.append("BTCUSDT", now - 20, 1.0)
+    store.append("BTCUSDT", now - 10, 2.0)
+    store.flush()
+    assert store.last_prices(["BTCUSDT"]) == {"BTCUSDT": (now - 20, 1.0)}
+    store.flush(final=True)
+    assert store.last_prices(["BTCUSDT"]) == {"BTCUSDT": (now - 10, 2.0)}
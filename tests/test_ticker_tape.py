@@ -0,0 +1,54 @@
+def symbols(n):
+    return [f"C{i}USDT" for i in range(n)]
+
+
+def tape(cw, widget, count):
+    cw.config["watchlist"] = [{"symbol": s, "decimals": 2} for s in symbols(count)]
+    cw.config["display_mode"] = "ticker"
+    widget.apply_settings({"watchlist", "display_mode"})
+    widget.tape_timer.stop()
+    widget._on_prices_fetched({s: 1.0 + i for i, s in enumerate(symbols(count))})
+    return widget._tape_layout()
+
+
+def test_price_change_updates_the_layout_in_place(cw, widget):
+    tape(cw, widget, 50)
+    # widths change with the number of digits
+    for k, s in enumerate(symbols(50)[:20]):
+        widget._on_prices_fetched({s: 10 ** (k % 7) + 0.5})
+    offsets, length = list(widget._tape_offsets), widget._tape_length
+    widget._tape_offsets = None
+    full_offsets, full_length = widget._tape_layout()
+    assert offsets == list(full_offsets)
+    assert length == full_length
+
+
+def test_off_screen_price_change_measures_one_item(cw, widget, monkeypatch):
+    tape(cw, widget, 200)
+    measured = []
+    real = widget._item_width
+    monkeypatch.setattr(widget, "_item_width", lambda record, fm: measured.append(record.symbol) or real(record, fm))
+    widget._on_prices_fetched({"C150USDT": 123456.75})
+    widget._tape_layout()
+    assert measured == ["C150USDT"]
+
+
+def test_watchlist_edit_patches_the_tape(cw, widget, monkeypatch):
+    tape(cw, widget, 100)
+    widget._tape_scroll = widget._tape_offsets[40] + 5
+    widget._slide_cache[("C60USDT", 255)] = ("key", None)
+    measured = []
+    real = widget._item_width
+    monkeypatch.setattr(widget, "_item_width", lambda record, fm: measured.append(record.symbol) or real(record, fm))
+    entries = [{"symbol": s, "decimals": 2} for s in symbols(100) if s not in ("C3USDT", "C70USDT")]
+    entries[10]["decimals"] = 4
+    cw.config["watchlist"] = entries + [{"symbol": "NEWUSDT", "decimals": 2}]
+    widget.apply_settings({"watchlist"})
+    assert sorted(measured) == ["C11USDT", "NEWUSDT"]
+    assert widget._tape_scroll == widget._tape_offsets[widget.watchlist.position("C40USDT")] + 5
+    assert ("C60USDT", 255) in widget._slide_cache
+    offsets, length = list(widget._tape_offsets), widget._tape_length
+    widget._tape_offsets = None
+    full_offsets, full_length = widget._tape_layout()
+    assert offsets == list(full_offsets)
+    assert length == full_length